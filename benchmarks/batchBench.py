@@ -0,0 +1,47 @@
+'''
+Benchmark that measures the throughput of the batch renderer for several numbers of
+worker processes, on a synthetic 4K wallpaper rendered for three resolutions
+
+Usage: python -m benchmarks.batchBench
+'''
+
+import datetime
+import os
+import tempfile
+import time
+from PIL import Image
+from scripts.DOMAIN.event import Event
+from scripts.DOMAIN.wallpaper import Wallpaper
+from scripts.REPO.settingsRepo import Settings
+from scripts.renderer.batchRenderer import BatchRenderer
+
+SIZES = [(1920, 1080), (2560, 1440), (3840, 2160)]
+JOBS = 24
+
+def run():
+    settings = Settings(os.path.join("data", "settings.toml"))
+    today = datetime.date.today()
+    categorizedEvents = [[Event(f"Event {i}", "Synthetic event", today, today) for i in range(10)] for _ in settings.COLUMNS]
+
+    workerCounts = sorted({1, 2, 4, os.cpu_count() or 1})
+
+    with tempfile.TemporaryDirectory() as directory:
+        sourcePath = os.path.join(directory, "source.jpg")
+        Image.radial_gradient("L").resize((3840, 2160)).convert("RGB").save(sourcePath)
+
+        wallpaper = Wallpaper(sourcePath)
+        jobs = [(wallpaper, SIZES[i % len(SIZES)]) for i in range(JOBS)]
+
+        print(f"{'workers':>8} {'time (s)':>10} {'jobs/s':>8}")
+
+        for workers in workerCounts:
+            renderer = BatchRenderer(settings, os.path.join(directory, f"output{workers}"), workers)
+
+            start = time.perf_counter()
+            renderer.render(jobs, categorizedEvents)
+            elapsed = time.perf_counter() - start
+
+            print(f"{workers:>8} {elapsed:>10.2f} {JOBS / elapsed:>8.1f}")
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,57 @@
+'''
+Benchmark that compares the split of the events by deadline through the deadline index with a linear
+scan of all the events, with and without reading every split event
+
+Usage: python -m benchmarks.deadlineBench
+'''
+
+import bisect
+import datetime
+import os
+import tempfile
+import time
+from scripts.REPO.eventsRepo import EventsRepo
+from .synthetic import write_events_file
+
+SIZES = [10_000, 100_000, 200_000]
+BUCKET_DAYS = [1, 7]
+
+def linear_scan(events, boundaries):
+    groups = [[] for _ in range(len(boundaries) + 1)]
+    for el in events:
+        groups[bisect.bisect_left(boundaries, el.get_endingDate())].append(el)
+
+    return groups
+
+def run():
+    print(f"{'events':>10} {'linear scan (ms)':>18} {'index split (ms)':>18} {'index + read (ms)':>19}")
+
+    today = datetime.date.today()
+    boundaries = [today + datetime.timedelta(days=days) for days in BUCKET_DAYS]
+
+    for size in SIZES:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "events.txt")
+            write_events_file(path, size)
+
+            repo = EventsRepo(path)
+
+            start = time.perf_counter()
+            linear_scan(repo.get_events(), boundaries)
+            scanTime = time.perf_counter() - start
+
+            start = time.perf_counter()
+            groups = repo.get_events_by_deadline(boundaries)
+            splitTime = time.perf_counter() - start
+
+            #The groups are read lazily, the views of the events are created here
+            for events in groups:
+                list(events)
+            readTime = time.perf_counter() - start
+
+            repo.close()
+
+        print(f"{size:>10} {scanTime * 1000:>18.1f} {splitTime * 1000:>18.1f} {readTime * 1000:>19.1f}")
+
+if __name__ == "__main__":
+    run()
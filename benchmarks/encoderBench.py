@@ -0,0 +1,55 @@
+'''
+Benchmark that compares the output presets of the encoder: the time to encode a rendered
+wallpaper, the size of the file, and the time to decode it again (what the OS does when
+it loads the wallpaper), so the right tradeoff can be chosen for every machine
+
+Usage: python -m benchmarks.encoderBench [width height]
+'''
+
+import os
+import sys
+import tempfile
+import time
+from PIL import Image
+from scripts.renderer.encoder import Encoder
+from .synthetic import write_photo
+
+SIZE = (3840, 2160)
+REPEATS = 3
+
+def best_time(function, repeats = REPEATS):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+
+    return min(times)
+
+def decode(path):
+    with Image.open(path) as img:
+        img.load()
+
+def run(size = SIZE):
+    with tempfile.TemporaryDirectory() as directory:
+        sourcePath = os.path.join(directory, "source.jpg")
+        write_photo(sourcePath, size)
+        with Image.open(sourcePath) as img:
+            img.load()
+
+        encoders = {"source (PIL defaults)": Encoder()}
+        encoders.update((name, Encoder.from_preset(name)) for name in Encoder.PRESETS)
+
+        print(f"{size[0]}x{size[1]}")
+        print(f"{'preset':<22} {'encode (ms)':>12} {'size (KiB)':>12} {'decode (ms)':>12}")
+
+        for name, encoder in encoders.items():
+            outputPath = os.path.join(directory, "output" + encoder.get_extension(sourcePath))
+
+            encodeTime = best_time(lambda: encoder.save(img, outputPath))
+            decodeTime = best_time(lambda: decode(outputPath))
+
+            print(f"{name:<22} {encodeTime * 1000:>12.1f} {os.path.getsize(outputPath) / 1024:>12.0f} {decodeTime * 1000:>12.1f}")
+
+if __name__ == "__main__":
+    run((int(sys.argv[1]), int(sys.argv[2])) if len(sys.argv) > 2 else SIZE)
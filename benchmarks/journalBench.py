@@ -0,0 +1,40 @@
+'''
+Benchmark that measures the cost of a single EventsRepo mutation as the number of events grows
+
+Usage: python -m benchmarks.journalBench
+'''
+
+import os
+import tempfile
+import time
+from scripts.REPO.eventsRepo import EventsRepo
+from .synthetic import write_events_file
+
+SIZES = [1_000, 10_000, 50_000]
+MUTATIONS = 200
+
+def run():
+    print(f"{'events':>10} {'mutation (ms)':>15} {'full rewrite (ms)':>20}")
+
+    for size in SIZES:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "events.txt")
+            write_events_file(path, size)
+
+            repo = EventsRepo(path, compactionThreshold=MUTATIONS + 1)
+            count = len(repo.get_events())
+
+            start = time.perf_counter()
+            for i in range(MUTATIONS):
+                repo.mark_as_done(i % count)
+            mutationTime = (time.perf_counter() - start) / MUTATIONS
+
+            #The full rewrite is what every mutation used to cost before the journal
+            start = time.perf_counter()
+            repo.compact()
+            rewriteTime = time.perf_counter() - start
+
+        print(f"{size:>10} {mutationTime * 1000:>15.3f} {rewriteTime * 1000:>20.3f}")
+
+if __name__ == "__main__":
+    run()
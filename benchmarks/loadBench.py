@@ -0,0 +1,65 @@
+'''
+Benchmark that measures the startup time of EventsRepo (loading the events data file),
+compared with the previous line by line loader
+
+Usage: python -m benchmarks.loadBench [rows]
+'''
+
+import datetime
+import os
+import sys
+import tempfile
+import time
+from scripts.DOMAIN.event import Event
+from scripts.REPO.eventsRepo import EventsRepo
+from .synthetic import write_events_file
+
+ROWS = 1_000_000
+
+def legacy_load(filename):
+    '''
+    Function that loads the data file the way EventsRepo used to: one readline() per row,
+    both dates parsed and an Event created before the expired rows are dropped
+    '''
+
+    events = []
+    with open(filename, "r") as file:
+        line = file.readline()
+
+        while line:
+            line = line.strip().split(",")
+
+            date1 = datetime.date.fromisoformat(line[2])
+            date2 = datetime.date.fromisoformat(line[3])
+            done = line[4] == "True"
+
+            if done and datetime.date.today() > date2:
+                line = file.readline()
+                continue
+
+            event = Event(line[0], line[1], date1, date2)
+            if done: event.set_as_done()
+            events.append(event)
+
+            line = file.readline()
+
+    return events
+
+def run(rows = ROWS):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "events.txt")
+        write_events_file(path, rows)
+
+        start = time.perf_counter()
+        legacyCount = len(legacy_load(path))
+        legacyTime = time.perf_counter() - start
+
+        start = time.perf_counter()
+        count = len(EventsRepo(path).get_events())
+        loadTime = time.perf_counter() - start
+
+    assert count == legacyCount
+    print(f"{rows} rows ({count} kept): previous loader {legacyTime:.2f} s, EventsRepo {loadTime:.2f} s")
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else ROWS)
@@ -0,0 +1,80 @@
+'''
+Benchmark that compares the memory used by the events, kept as a list of regular objects
+(the previous representation), as a list of slotted 'Event' objects and in an 'EventStore'
+
+Usage: python -m benchmarks.memoryBench [rows]
+'''
+
+import datetime
+import os
+import sys
+import tempfile
+import tracemalloc
+from scripts.DOMAIN.event import Event
+from scripts.REPO.eventsLoader import read_event_columns
+from scripts.REPO.eventStore import EventStore
+from .synthetic import write_events_file
+
+ROWS = 200_000
+
+class LegacyEvent:
+    '''The previous 'Event' representation, with a __dict__ per object'''
+
+    def __init__(self, name, description, startingDate, endingDate):
+        self.__name = name
+        self.__description = description
+        self.__startingDate = startingDate
+        self.__endingDate = endingDate
+        self.__done = False
+
+    def set_as_done(self):
+        self.__done = True
+
+def build_objects(path, factory):
+    events = []
+    for columns in read_event_columns(path, datetime.date.min):
+        for name, description, startingDate, endingDate, done in zip(*columns):
+            event = factory(name, description, startingDate, endingDate)
+            if done: event.set_as_done()
+            events.append(event)
+
+    return events
+
+def build_store(path):
+    store = EventStore()
+    for columns in read_event_columns(path, datetime.date.min):
+        store.extend(columns)
+
+    return store
+
+def measure(build, path):
+    '''
+    Function that returns the memory still used after loading the file from 'path' with 'build'
+    (the strings and dates of the events included)
+    '''
+
+    tracemalloc.start()
+    result = build(path)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    del result
+    return size
+
+def run(count = ROWS):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "events.txt")
+        write_events_file(path, count)
+
+        results = [
+            ("list of objects (previous)", measure(lambda path: build_objects(path, LegacyEvent), path)),
+            ("list of slotted Event", measure(lambda path: build_objects(path, Event), path)),
+            ("EventStore", measure(build_store, path)),
+        ]
+
+    print(f"{count} events")
+    for name, size in results:
+        print(f"{name:>28}: {size / 1024 / 1024:8.1f} MiB ({size / count:6.1f} bytes per event)")
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else ROWS)
@@ -0,0 +1,54 @@
+'''
+Micro-benchmark that measures the rendering of 500 events on a 1080p wallpaper: the first
+render (fonts loaded, every line measured), then renders where every column changes, so all
+the tiles are drawn again, but with the fonts and text measurements already cached
+
+Usage: python -m benchmarks.renderBench
+'''
+
+import datetime
+import os
+import tempfile
+import time
+from PIL import Image
+from scripts.DOMAIN.event import Event
+from scripts.DOMAIN.wallpaper import Wallpaper
+from scripts.REPO.settingsRepo import Settings
+from scripts.renderer.textRenderer import TextRenderer
+
+EVENTS = 500
+RENDERS = 10
+
+def make_categorized_events(count, columns):
+    today = datetime.date.today()
+    categorizedEvents = [[] for _ in range(columns)]
+
+    for i in range(count):
+        categorizedEvents[i % columns].append(Event(f"Event {i}", "Synthetic event", today, today))
+
+    return categorizedEvents
+
+def run():
+    settings = Settings(os.path.join("data", "settings.toml"))
+    renderer = TextRenderer(settings)
+    categorizedEvents = make_categorized_events(EVENTS, len(settings.COLUMNS))
+    base = Image.new("RGB", (1920, 1080), (40, 60, 90))
+
+    with tempfile.TemporaryDirectory() as directory:
+        outputPath = os.path.join(directory, "wallpaper.bmp")
+
+        start = time.perf_counter()
+        renderer.add_text_to_wallpaper(Wallpaper(outputPath), base, categorizedEvents, outputPath)
+        coldTime = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for i in range(RENDERS):
+            for events in categorizedEvents:
+                events[i].set_as_done() #Every column changes, so no tile can be reused
+            renderer.add_text_to_wallpaper(Wallpaper(outputPath), base, categorizedEvents, outputPath)
+        warmTime = (time.perf_counter() - start) / RENDERS
+
+    print(f"{EVENTS} events, first render: {coldTime * 1000:.1f} ms, next renders: {warmTime * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    run()
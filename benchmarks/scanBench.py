@@ -0,0 +1,54 @@
+'''
+Benchmark that measures the cold scan of a wallpapers directory (no metadata index yet): with the
+default settings, which only list the images and read their headers when they are needed, then with
+the headers read during the scan (probe_on_scan = true), by a single worker and by the thread pool
+
+Usage: python -m benchmarks.scanBench
+'''
+
+import os
+import tempfile
+import time
+from scripts.REPO.wallpapersRepo import WallpapersRepo
+from scripts.REPO.wallpaperIndex import WallpaperIndex
+from scripts.REPO.wallpaperScanner import WallpaperScanner
+from .synthetic import write_wallpapers
+
+IMAGES = 5_000
+WORKERS = [1, 4, 8, 16]
+
+def scan(wallpapersDirectory, indexFilename, scanner, probeOnScan):
+    '''
+    Function that times a scan without a metadata index, then a scan with the index it wrote
+
+    Returns:
+        (tuple): The cold and the warm scan times, in seconds
+    '''
+
+    times = []
+    for _ in range(2):
+        start = time.perf_counter()
+        WallpapersRepo(wallpapersDirectory, WallpaperIndex(indexFilename), scanner, probeOnScan=probeOnScan)
+        times.append(time.perf_counter() - start)
+
+    return tuple(times)
+
+def run():
+    with tempfile.TemporaryDirectory() as directory:
+        wallpapersDirectory = os.path.join(directory, "wallpapers")
+        write_wallpapers(wallpapersDirectory, IMAGES)
+
+        print(f"{'probe':>6} {'workers':>8} {'cold scan (s)':>15} {'warm scan (s)':>15}")
+
+        #The default: no header is read during the scan, so the workers are not used
+        indexFilename = os.path.join(directory, "indexLazy.json")
+        coldTime, warmTime = scan(wallpapersDirectory, indexFilename, WallpaperScanner(), False)
+        print(f"{'no':>6} {'-':>8} {coldTime:>15.3f} {warmTime:>15.3f}")
+
+        for workers in WORKERS:
+            indexFilename = os.path.join(directory, f"index{workers}.json")
+            coldTime, warmTime = scan(wallpapersDirectory, indexFilename, WallpaperScanner(maxWorkers=workers), True)
+            print(f"{'yes':>6} {workers:>8} {coldTime:>15.3f} {warmTime:>15.3f}")
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,223 @@
+'''
+Benchmark suite that measures the main stages of the program on synthetic data, writes the
+results as JSON and compares them with a stored baseline:
+    - events_load/<rows>: EventsRepo construction from an events data file
+    - categorize/<rows>: EventService.get_categorized_events
+    - wallpapers_scan/<images>/cold and /warm: WallpapersRepo construction without / with a metadata index
+    - render/<resolution>: TextRenderer.add_text_to_wallpaper (source decode, draw, encode)
+    - create_set_wallpaper/<resolution>: the whole Service.create_set_wallpaper, with the OS wallpaper
+      setter replaced by LocalWallpaperSys and an empty render cache
+
+Every benchmark is repeated and the minimum time is compared, a benchmark more than 'tolerance'
+(and more than MIN_SLOWDOWN) slower than the baseline is a regression (exit code 1). The baseline is machine
+specific, so it's not part of the repository: the first run on a machine (or a run with '--save-baseline')
+stores its results as the baseline, the next runs are compared with it
+
+Usage: python -m benchmarks.suite [--quick] [--repeats N] [--output FILE] [--baseline FILE] [--tolerance 0.5] [--save-baseline]
+'''
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from scripts.DOMAIN.event import Event
+from scripts.DOMAIN.validator import Validator
+from scripts.DOMAIN.wallpaper import Wallpaper
+from scripts.REPO.eventsRepo import EventsRepo
+from scripts.REPO.settingsRepo import Settings
+from scripts.REPO.wallpaperIndex import WallpaperIndex
+from scripts.REPO.wallpaperScanner import WallpaperScanner
+from scripts.REPO.wallpapersRepo import WallpapersRepo
+from scripts.renderer.renderCache import RenderCache
+from scripts.renderer.textRenderer import TextRenderer
+from scripts.service import Service
+from scripts.services.eventsService import EventService
+from scripts.services.wallpaperService import WallpaperService
+from scripts.system.wallpaperSys import LocalWallpaperSys
+from .synthetic import write_events_file, write_photo, write_wallpapers
+
+EVENT_ROWS = [1_000, 10_000, 100_000, 1_000_000]
+WALLPAPER_IMAGES = [100, 1_000]
+RESOLUTIONS = {"1080p": (1920, 1080), "1440p": (2560, 1440), "4K": (3840, 2160), "8K": (7680, 4320)}
+RENDERED_EVENTS = 30 #Events drawn on the rendered wallpapers
+
+QUICK_EVENT_ROWS = EVENT_ROWS[:3]
+QUICK_WALLPAPER_IMAGES = WALLPAPER_IMAGES[:1]
+QUICK_RESOLUTIONS = ["1080p", "4K"]
+
+BASELINE = os.path.join("benchmarks", "baseline.json")
+OUTPUT = os.path.join("temp", "benchmarks.json")
+TOLERANCE = 0.5 #Shared and virtual machines easily vary by 30%
+REPEATS = 5
+MIN_SLOWDOWN = 0.002 #Seconds, smaller differences are timer and scheduling noise
+
+def measure(function, repeats, setup = None):
+    '''
+    Function that times 'function' 'repeats' times
+
+    Args:
+        function (callable): The measured code, called with the value returned by 'setup'
+        repeats (int): The number of measurements
+        setup (callable): Optional code called (untimed) before every measurement
+
+    Returns:
+        (dict): The minimum and median times, in seconds, and the number of repeats
+    '''
+
+    times = []
+    for _ in range(repeats):
+        argument = setup() if setup is not None else None
+
+        start = time.perf_counter()
+        function(argument)
+        times.append(time.perf_counter() - start)
+
+    return {"min": min(times), "median": statistics.median(times), "repeats": repeats}
+
+def bench_events(directory, rows, settings, repeats, results):
+    path = os.path.join(directory, f"events{rows}.txt")
+    write_events_file(path, rows)
+
+    results[f"events_load/{rows}"] = measure(lambda _: EventsRepo(path), repeats)
+
+    eventService = EventService(EventsRepo(path), Validator(), Event, settings.BUCKET_DAYS)
+    results[f"categorize/{rows}"] = measure(lambda _: eventService.get_categorized_events(), repeats)
+
+def bench_scan(directory, images, repeats, results):
+    wallpapersDirectory = os.path.join(directory, f"wallpapers{images}")
+    indexFilename = os.path.join(directory, f"index{images}.json")
+    write_wallpapers(wallpapersDirectory, images)
+
+    def remove_index():
+        if os.path.exists(indexFilename):
+            os.remove(indexFilename)
+
+    scan = lambda _: WallpapersRepo(wallpapersDirectory, WallpaperIndex(indexFilename), WallpaperScanner(), probeOnScan=True)
+    results[f"wallpapers_scan/{images}/cold"] = measure(scan, repeats, remove_index)
+    results[f"wallpapers_scan/{images}/warm"] = measure(scan, repeats)
+
+def bench_render(directory, resolution, settings, eventService, repeats, results):
+    path = os.path.join(directory, f"wallpaper{resolution}.jpg")
+    write_photo(path, RESOLUTIONS[resolution])
+    wallpaper = Wallpaper(path)
+    outputPath = os.path.join(directory, f"output{resolution}.jpg")
+    categorizedEvents = eventService.get_categorized_events()
+
+    #A new renderer for every measurement, so no column tile is reused
+    results[f"render/{resolution}"] = measure(
+        lambda renderer: renderer.add_text_to_wallpaper(wallpaper, path, categorizedEvents, outputPath),
+        repeats, lambda: TextRenderer(settings)
+    )
+
+    renderCache = RenderCache(os.path.join(directory, "renders"), settings)
+    def make_service():
+        renderCache.clear()
+        return Service(eventService, WallpaperService(None), LocalWallpaperSys(), TextRenderer(settings), renderCache)
+
+    results[f"create_set_wallpaper/{resolution}"] = measure(lambda service: service.create_set_wallpaper(wallpaper), repeats, make_service)
+
+def run_suite(quick = False, repeats = REPEATS):
+    '''
+    Function that runs every benchmark
+
+    Args:
+        quick (bool): If True, the largest inputs are skipped
+        repeats (int): The number of measurements of every benchmark
+
+    Returns:
+        (dict): The machine description and the results, by benchmark name
+    '''
+
+    settings = Settings(os.path.join("data", "settings.toml"))
+    results = {}
+
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in QUICK_EVENT_ROWS if quick else EVENT_ROWS:
+            print(f"events: {rows} rows", file=sys.stderr)
+            bench_events(directory, rows, settings, repeats, results)
+
+        for images in QUICK_WALLPAPER_IMAGES if quick else WALLPAPER_IMAGES:
+            print(f"wallpapers: {images} images", file=sys.stderr)
+            bench_scan(directory, images, repeats, results)
+
+        eventsPath = os.path.join(directory, "rendered.txt")
+        write_events_file(eventsPath, RENDERED_EVENTS)
+        eventService = EventService(EventsRepo(eventsPath), Validator(), Event, settings.BUCKET_DAYS)
+
+        for resolution in QUICK_RESOLUTIONS if quick else RESOLUTIONS:
+            print(f"render: {resolution}", file=sys.stderr)
+            bench_render(directory, resolution, settings, eventService, repeats, results)
+
+    return {
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "cpus": os.cpu_count(),
+        "results": results
+    }
+
+def compare(report, baseline, tolerance = TOLERANCE):
+    '''
+    Function that compares the results of 'report' with the results of 'baseline', only the
+    benchmarks found in both are compared
+
+    Returns:
+        (list of tuples): (name, baseline time, time, ratio, regression) for every compared benchmark
+    '''
+
+    rows = []
+    for name, result in report["results"].items():
+        if name not in baseline["results"]:
+            continue
+
+        baselineTime = baseline["results"][name]["min"]
+        ratio = result["min"] / baselineTime if baselineTime else 1.0
+        regression = ratio > 1 + tolerance and result["min"] - baselineTime > MIN_SLOWDOWN
+        rows.append((name, baselineTime, result["min"], ratio, regression))
+
+    return rows
+
+def write_json(path, data):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as file:
+        json.dump(data, file, indent=4)
+        file.write("\n")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark suite of the events loading, categorization, wallpaper scanning and rendering",
+        epilog="The baseline is specific to this machine: the first run stores its results as the baseline, the next runs are compared with it"
+    )
+    parser.add_argument("--quick", action="store_true", help="skip the largest inputs")
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--output", default=OUTPUT, help="where the results are written as JSON")
+    parser.add_argument("--baseline", default=BASELINE, help="the results of this machine that are compared with, created by the first run")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="allowed slowdown over the baseline (0.5 is 50%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the new baseline")
+    arguments = parser.parse_args()
+
+    report = run_suite(arguments.quick, arguments.repeats)
+    write_json(arguments.output, report)
+    print(f"Results written to '{arguments.output}'")
+
+    if arguments.save_baseline or not os.path.exists(arguments.baseline):
+        for name, result in report["results"].items():
+            print(f"{name:<36} {result['min'] * 1000:>12.2f} ms")
+        write_json(arguments.baseline, report)
+        print(f"Baseline written to '{arguments.baseline}', the next runs are compared with it")
+        sys.exit(0)
+
+    with open(arguments.baseline, "r") as file:
+        baseline = json.load(file)
+
+    rows = compare(report, baseline, arguments.tolerance)
+    print(f"{'benchmark':<36} {'baseline (ms)':>14} {'now (ms)':>12} {'ratio':>7}")
+    for name, baselineTime, currentTime, ratio, regression in rows:
+        print(f"{name:<36} {baselineTime * 1000:>14.2f} {currentTime * 1000:>12.2f} {ratio:>7.2f}{'  REGRESSION' if regression else ''}")
+
+    sys.exit(1 if any(row[4] for row in rows) else 0)
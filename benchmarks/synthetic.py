@@ -0,0 +1,72 @@
+import datetime
+import os
+import random
+from PIL import Image
+
+def write_events_file(path, count, seed = 0):
+    '''
+    Function that writes a synthetic events data file
+
+    Args:
+        path (string): The path of the file that will be written
+        count (int): The number of events that will be generated
+        seed (int): The seed of the random generator, so runs are reproducible
+    '''
+
+    generator = random.Random(seed)
+    today = datetime.date.today()
+
+    with open(path, "w") as file:
+        for i in range(count):
+            startingDate = today + datetime.timedelta(days=generator.randint(-60, 30))
+            endingDate = startingDate + datetime.timedelta(days=generator.randint(0, 60))
+            done = "True" if generator.random() < 0.3 else "False"
+
+            file.write(f"Event{i},Synthetic event number {i},{startingDate.isoformat()},{endingDate.isoformat()},{done}\n")
+
+def write_wallpapers(directory, count, size = (64, 36), seed = 0):
+    '''
+    Function that writes synthetic wallpapers, cycling through the supported formats
+
+    Args:
+        directory (string): The directory where the images will be written
+        count (int): The number of images that will be generated
+        size (tuple of ints): The (width, height) of the images
+        seed (int): The seed of the random generator, so runs are reproducible
+
+    Returns:
+        (list of strings): The paths of the written images
+    '''
+
+    generator = random.Random(seed)
+    extensions = [".jpg", ".png", ".gif", ".webp", ".bmp"]
+    paths = []
+
+    os.makedirs(directory, exist_ok=True)
+    for i in range(count):
+        color = tuple(generator.randrange(256) for _ in range(3))
+        path = os.path.join(directory, f"wallpaper{i}{extensions[i % len(extensions)]}")
+
+        Image.new("RGB", size, color).save(path)
+        paths.append(path)
+
+    return paths
+
+def write_photo(path, size, seed = 0):
+    '''
+    Function that writes a synthetic wallpaper with noise over a gradient, so it compresses
+    (and decodes) more like a photo than a single color image does
+
+    Args:
+        path (string): The path of the image, its extension gives the format
+        size (tuple of ints): The (width, height) of the image
+        seed (int): The seed of the random generator, so runs are reproducible
+    '''
+
+    generator = random.Random(seed)
+    gradient = Image.linear_gradient("L").resize(size)
+    #The noise is generated at a quarter of the size, generating it at 8K takes seconds
+    noiseSize = (max(1, size[0] // 4), max(1, size[1] // 4))
+    channels = [Image.blend(gradient, Image.effect_noise(noiseSize, generator.randint(16, 64)).resize(size), 0.3) for _ in range(3)]
+
+    Image.merge("RGB", channels).save(path)
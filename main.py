@@ -1,16 +1,139 @@
 from scripts.REPO.eventsRepo import EventsRepo
+from scripts.REPO.sqliteEventsRepo import SqliteEventsRepo
 from scripts.REPO.wallpapersRepo import WallpapersRepo
+from scripts.REPO.wallpaperIndex import WallpaperIndex
+from scripts.REPO.wallpaperScanner import WallpaperScanner
 from scripts.DOMAIN.event import Event
 from scripts.DOMAIN.wallpaper import Wallpaper
 from scripts.service import Service
 from scripts.ui import UI
 from scripts.DOMAIN.validator import Validator
 from scripts.renderer.textRenderer import TextRenderer
-from scripts.system.wallpaperSys import WallpaperSys
+from scripts.renderer.renderCache import RenderCache
+from scripts.renderer.imageCache import ImageCache
+from scripts.renderer.batchRenderer import BatchRenderer
+from scripts.renderer.encoder import Encoder
+from scripts.system.wallpaperSys import WallpaperSys, LocalWallpaperSys
+from scripts.scheduler import Scheduler
+from scripts.renderWorker import RenderWorker
+from scripts.settingsWatcher import SettingsWatcher
+from scripts.debouncer import Debouncer
+from scripts.profiling import Profiler, RingBufferSink, JsonLinesSink, PrometheusSink, NULL_PROFILER
 from scripts.services.eventsService import EventService
 from scripts.services.wallpaperService import WallpaperService
 from scripts.REPO.settingsRepo import Settings
+from scripts.utils import EventsRepoError
+import argparse
+import atexit
 import os
+import sys
 
-ui = UI(Service(EventService(EventsRepo(os.path.join("data", "events.txt")), Validator(), Event), WallpaperService(WallpapersRepo()), WallpaperSys(), TextRenderer(Settings(os.path.join("data", "settings.toml")))))
-ui.run()
\ No newline at end of file
+def print_scan_progress(done, total):
+    print(f"\rReading new wallpapers: {done}/{total}", end="\n" if done == total else "")
+
+def print_settings_error(error):
+    print(f"\nThe changed settings couldn't be used: {error}")
+
+def print_render_error(error):
+    print(f"The wallpaper couldn't be set, trying again in {Scheduler.RETRY_SECONDS} seconds: {error}")
+
+#The guard is needed by the batch renderer: its worker processes import this module
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="TODO list drawn over the desktop wallpaper")
+    parser.add_argument("--daemon", metavar="WALLPAPER", help="run without the menu, keeping WALLPAPER up to date as the events change category")
+    parser.add_argument("--batch", nargs="+", metavar=("WALLPAPER", "SIZE"), help="render WALLPAPER once for every SIZE (for example 1920x1080 2560x1440), without setting it")
+    parser.add_argument("--local", action="store_true", help="don't change the OS wallpaper, only render it")
+    parser.add_argument("--import", dest="importFile", metavar="FILE", help="add the events of a .csv, .jsonl or .ics FILE, then exit")
+    parser.add_argument("--export", dest="exportFile", metavar="FILE", help="write the events to a .csv, .jsonl or .ics FILE, then exit")
+    arguments = parser.parse_args()
+
+    try:
+        settings = Settings(os.path.join("data", "settings.toml"), print_settings_error)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"The settings are not valid: {e}")
+        sys.exit(1)
+
+    #The events storage backend is chosen in the settings file
+    try:
+        if settings.STORAGE_BACKEND == "sqlite":
+            eventsRepo = SqliteEventsRepo(settings.EVENTS_DATABASE)
+        elif settings.STORAGE_BACKEND == "binary":
+            eventsRepo = EventsRepo(settings.EVENTS_SNAPSHOT, writeBehind=settings.WRITE_BEHIND)
+        else:
+            eventsRepo = EventsRepo(settings.EVENTS_FILE, writeBehind=settings.WRITE_BEHIND)
+    except (EventsRepoError, OSError) as e: #A damaged journal or snapshot, or a missing data file
+        print(f"The events couldn't be loaded: {e}")
+        sys.exit(1)
+
+    #Profiling of the wallpaper creation, the records are flushed to the sink on exit
+    if not settings.PROFILING_ENABLED:
+        profiler = NULL_PROFILER
+    elif settings.PROFILING_SINK == "jsonl":
+        profiler = Profiler(JsonLinesSink(settings.PROFILING_PATH))
+    elif settings.PROFILING_SINK == "prometheus":
+        profiler = Profiler(PrometheusSink(settings.PROFILING_PATH))
+    else:
+        profiler = Profiler(RingBufferSink(settings.PROFILING_BUFFER_SIZE))
+    atexit.register(profiler.flush)
+
+    wallpaperScanner = WallpaperScanner(settings.WALLPAPERS_EXTENSIONS, settings.WALLPAPERS_RECURSIVE, settings.WALLPAPERS_SCAN_WORKERS)
+    wallpapersRepo = WallpapersRepo(settings.WALLPAPERS_DIRECTORY, WallpaperIndex(settings.WALLPAPERS_INDEX), wallpaperScanner, settings.WALLPAPERS_PROBE_ON_SCAN, print_scan_progress)
+
+    imageCache = ImageCache(settings.IMAGE_CACHE_BYTES, settings.DISPLAY_SIZE)
+    renderCache = RenderCache(settings.RENDER_CACHE_DIRECTORY, settings, settings.RENDER_CACHE_ENTRIES, settings.RENDER_CACHE_BYTES)
+    batchRenderer = BatchRenderer(settings, settings.BATCH_DIRECTORY, settings.BATCH_WORKERS)
+
+    wallpaperSys = LocalWallpaperSys() if arguments.local else WallpaperSys()
+    #The text data file can't store its separators inside an event
+    validator = Validator(",\n" if settings.STORAGE_BACKEND == "text" else "")
+    eventService = EventService(eventsRepo, validator, Event, settings.BUCKET_DAYS)
+    textRenderer = TextRenderer(settings, imageCache, profiler=profiler, encoder=Encoder.from_settings(settings))
+    service = Service(eventService, WallpaperService(wallpapersRepo), wallpaperSys, textRenderer, renderCache, batchRenderer, profiler, settings)
+
+    #After the settings file changed, what was computed from the old settings is dropped (the render cache keys contain the settings)
+    settings.subscribe(textRenderer.clear_caches)
+    settings.subscribe(lambda: imageCache.set_target_size(settings.DISPLAY_SIZE))
+    settings.subscribe(lambda: textRenderer.set_encoder(Encoder.from_settings(settings)))
+    settings.subscribe(lambda: eventService.set_bucket_days(settings.BUCKET_DAYS))
+
+    #The changes of the events are written once they stop coming, and always before exiting
+    persistence = Debouncer(settings.CHANGES_DELAY, service.flush)
+    service.subscribe(persistence.trigger)
+    atexit.register(persistence.flush)
+
+    if arguments.importFile or arguments.exportFile:
+        try:
+            if arguments.importFile:
+                added, rejected = service.import_events(arguments.importFile)
+                print(f"Imported {added} events, {len(rejected)} records were not valid")
+                for position, message in rejected:
+                    print(f"line {position}: {message}")
+            else:
+                print(f"Exported {service.export_events(arguments.exportFile)} events")
+        except (OSError, ValueError) as e:
+            print(e)
+            sys.exit(1)
+    elif arguments.batch:
+        wallpaper = Wallpaper(arguments.batch[0])
+        jobs = [(wallpaper, tuple(int(value) for value in size.split("x"))) for size in arguments.batch[1:]]
+
+        for path in service.create_wallpapers(jobs):
+            print(path)
+    elif arguments.daemon:
+        #The settings file is not polled: the settings are loaded again (if they changed) every time the scheduler wakes up
+        Scheduler(service, Wallpaper(arguments.daemon), errorCallback=print_render_error).run()
+    else:
+        #The last set wallpaper is rendered again after the settings file changed
+        renderWorker = RenderWorker(service)
+        settingsWatcher = SettingsWatcher(service, settings.SETTINGS_RELOAD_SECONDS, renderWorker.refresh, print_settings_error)
+        settingsWatcher.start()
+
+        #After the changes of the events stop, the last set wallpaper is rendered again, once
+        rerender = Debouncer(settings.CHANGES_DELAY, renderWorker.refresh)
+        service.subscribe(rerender.trigger)
+
+        UI(service, renderWorker).run()
+
+        rerender.flush()
+        settingsWatcher.close()
+        renderWorker.close() #The last requested wallpaper is still set before exiting
@@ -1,4 +1,6 @@
 class Event:
+    __slots__ = ("__name", "__description", "__startingDate", "__endingDate", "__done")
+
     def __init__(self, name, description, startingDate, endingDate):
         '''
         Constructor function for 'Event' type object
@@ -16,6 +18,18 @@ class Event:
         self.__endingDate = endingDate
         self.__done = False
 
+    @classmethod
+    def from_event(cls, event):
+        '''
+        Function that creates an independent copy of 'event' (an event view of the repo, for example),
+        that doesn't change when the events of the repo change
+        '''
+
+        copy = cls(event.get_name(), event.get_description(), event.get_startingDate(), event.get_endingDate())
+        if event.is_done(): copy.set_as_done()
+
+        return copy
+
     def get_name(self):
         return self.__name
 
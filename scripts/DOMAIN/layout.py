@@ -0,0 +1,145 @@
+class Layout:
+    __slots__ = ("__marginX", "__marginY", "__columns", "__bucketDays", "__headerColor", "__columnColors", "__shadowColor", "__font", "__fontSize", "__lineSpacing", "__minFontSize", "__wrapLines", "__maxSubColumns")
+
+    def __init__(self, marginX, marginY, columns, bucketDays, headerColor, columnColors, shadowColor, font, fontSize, lineSpacing, minFontSize, wrapLines, maxSubColumns):
+        '''
+        Constructor function for the layout, the validated look of the drawn columns. A layout can't be
+        changed after it's created (the settings create a new one when they are loaded again), so a
+        render always uses one consistent layout
+
+        Args:
+            marginX (float): The horizontal margin, as a fraction of the width of the image
+            marginY (float): The vertical margin, as a fraction of the height of the image
+            columns (list of strings): The headers of the columns
+            bucketDays (list of ints): Increasing remaining days limits of every column, except the last one
+            headerColor (list of ints): The RGB color of the headers
+            columnColors (list of lists): The RGB color of the events of every column, same order as the columns
+            shadowColor (list of ints): The RGB color of the shadow of the text
+            font (string): The path (or name) of the TrueType font
+            fontSize (float): The size of the font, as a fraction of the height of the image
+            lineSpacing (int): The space between two lines, in pixels
+            minFontSize (float): The size the font can be shrunk to when the events don't fit, as a fraction of the height of the image
+            wrapLines (int): The most lines an event is wrapped to, the rest of it is cut (1 cuts every event to one line)
+            maxSubColumns (int): The most sub-columns a column is split into when its events don't fit even with the smallest font
+
+        Raises:
+            ValueError: If a value is not valid
+        '''
+
+        if not (0 <= marginX < 0.5 and 0 <= marginY < 1):
+            raise ValueError("The margins need to be fractions of the size of the image!")
+
+        columns = tuple(columns)
+        bucketDays = tuple(bucketDays)
+        if not columns:
+            raise ValueError("At least one column is needed!")
+        if len(bucketDays) + 1 != len(columns) or any(a >= b for a, b in zip(bucketDays, bucketDays[1:])):
+            raise ValueError("The columns need increasing day limits, one less than the number of columns!")
+
+        columnColors = tuple(self.__to_color(color) for color in columnColors)
+        if len(columnColors) != len(columns):
+            raise ValueError("Every column needs its own text color!")
+
+        if not 0 < fontSize < 1:
+            raise ValueError("The font size needs to be a fraction of the height of the image!")
+        if lineSpacing < 0:
+            raise ValueError("The line spacing can't be negative!")
+        if not 0 < minFontSize <= fontSize:
+            raise ValueError("The minimum font size needs to be a fraction of the height of the image, at most the font size!")
+        if wrapLines < 1 or maxSubColumns < 1:
+            raise ValueError("An event needs at least one line, and a column at least one sub-column!")
+
+        object.__setattr__(self, "_Layout__marginX", marginX)
+        object.__setattr__(self, "_Layout__marginY", marginY)
+        object.__setattr__(self, "_Layout__columns", columns)
+        object.__setattr__(self, "_Layout__bucketDays", bucketDays)
+        object.__setattr__(self, "_Layout__headerColor", self.__to_color(headerColor))
+        object.__setattr__(self, "_Layout__columnColors", columnColors)
+        object.__setattr__(self, "_Layout__shadowColor", self.__to_color(shadowColor))
+        object.__setattr__(self, "_Layout__font", font)
+        object.__setattr__(self, "_Layout__fontSize", fontSize)
+        object.__setattr__(self, "_Layout__lineSpacing", lineSpacing)
+        object.__setattr__(self, "_Layout__minFontSize", minFontSize)
+        object.__setattr__(self, "_Layout__wrapLines", wrapLines)
+        object.__setattr__(self, "_Layout__maxSubColumns", maxSubColumns)
+
+    @staticmethod
+    def __to_color(value):
+        '''
+        Function that converts a color from the settings to a tuple
+
+        Raises:
+            ValueError: If the color doesn't have 3 values from 0 to 255
+        '''
+
+        color = tuple(value)
+        if len(color) != 3 or not all(isinstance(channel, int) and 0 <= channel <= 255 for channel in color):
+            raise ValueError(f"A color needs 3 values from 0 to 255, not {list(value)}!")
+
+        return color
+
+    def __setattr__(self, name, value):
+        raise AttributeError("A layout can't be changed!")
+
+    def __reduce__(self):
+        return (Layout, self.get_values())
+
+    def __eq__(self, other):
+        return isinstance(other, Layout) and self.get_values() == other.get_values()
+
+    def __hash__(self):
+        return hash(self.get_values())
+
+    def __repr__(self):
+        return f"Layout{self.get_values()!r}"
+
+    def get_values(self):
+        '''
+        Function that returns all the values of the layout, in the order of the constructor arguments
+        '''
+
+        return (self.__marginX, self.__marginY, self.__columns, self.__bucketDays, self.__headerColor, self.__columnColors, self.__shadowColor, self.__font, self.__fontSize, self.__lineSpacing, self.__minFontSize, self.__wrapLines, self.__maxSubColumns)
+
+    def get_columns(self):
+        return self.__columns
+
+    def get_bucketDays(self):
+        return self.__bucketDays
+
+    def get_headerColor(self):
+        return self.__headerColor
+
+    def get_columnColor(self, index):
+        return self.__columnColors[index]
+
+    def get_shadowColor(self):
+        return self.__shadowColor
+
+    def get_font(self):
+        return self.__font
+
+    def get_lineSpacing(self):
+        return self.__lineSpacing
+
+    def get_wrapLines(self):
+        return self.__wrapLines
+
+    def get_maxSubColumns(self):
+        return self.__maxSubColumns
+
+    def get_geometry(self, width, height):
+        '''
+        Function that computes the pixel values of the layout for an image of size 'width' x 'height'
+
+        Returns:
+            (tuple): The horizontal and vertical margins, the width of a column, the horizontal center of every column, the font size and the smallest font size, in pixels
+        '''
+
+        marginX = int(width * self.__marginX)
+        marginY = int(height * self.__marginY)
+        columnWidth = (width - 2 * marginX) // len(self.__columns)
+        columnCenters = [marginX + columnWidth // 2 + columnWidth * i for i in range(len(self.__columns))]
+
+        fontSize = max(1, int(height * self.__fontSize))
+
+        return marginX, marginY, columnWidth, columnCenters, fontSize, min(fontSize, max(1, int(height * self.__minFontSize)))
@@ -1,6 +1,17 @@
 from ..utils import ValidationError
 
 class Validator:
+    def __init__(self, forbiddenCharacters = ""):
+        '''
+        Constructor function for the validator
+
+        Args:
+            forbiddenCharacters (string): Characters the name and the description can't contain (for example the
+            separators of the text data file: ",\n")
+        '''
+
+        self.__forbiddenCharacters = forbiddenCharacters
+
     def validate_event(self, event):
         '''
         Function that validates an event
@@ -9,7 +20,7 @@ class Validator:
             event (Event object): An event
 
         Raises:
-            ValidationError: If the name or description of the event are empty and if the dates of the event ar not valid
+            ValidationError: If the name or description of the event are empty or contain a forbidden character, and if the dates of the event ar not valid
         
         Returns:
             -
@@ -22,4 +33,8 @@ class Validator:
             raise ValidationError("Empty description!")
         
         if event.get_startingDate() > event.get_endingDate():
-            raise ValidationError("The ending date needs to be before the starting date!")
\ No newline at end of file
+            raise ValidationError("The ending date needs to be before the starting date!")
+
+        for character in self.__forbiddenCharacters:
+            if character in event.get_name() or character in event.get_description():
+                raise ValidationError(f"The name and the description can't contain {character!r}!")
\ No newline at end of file
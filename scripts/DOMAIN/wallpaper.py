@@ -1,15 +1,32 @@
 class Wallpaper:
-    def __init__(self, path, width, height):
+    def __init__(self, path, width = None, height = None, sizeLoader = None):
+        '''
+        Constructor function for 'Wallpaper' type object
+
+        Args:
+            path (string): The path of the image
+            width (int): The width of the image, None if it isn't known yet
+            height (int): The height of the image, None if it isn't known yet
+            sizeLoader (function): Function that returns the (width, height) of the image from its path,
+                                   called the first time the size is needed, if it isn't known yet
+        '''
+
         self.__path = path
         self.__width = width
         self.__height = height
-        pass
+        self.__sizeLoader = sizeLoader
+
+    def __load_size(self):
+        self.__width, self.__height = self.__sizeLoader(self.__path)
+        self.__sizeLoader = None
 
     def get_path(self) -> str:
         return self.__path
     
     def get_width(self) -> int:
+        if self.__width is None: self.__load_size()
         return self.__width
     
     def get_height(self) -> int:
-        return self.__height
\ No newline at end of file
+        if self.__height is None: self.__load_size()
+        return self.__height
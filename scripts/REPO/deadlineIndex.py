@@ -0,0 +1,68 @@
+import bisect
+
+class DeadlineIndex:
+    ID_BITS = 40 #An entry is the ending date ordinal and the event id packed in one int, so the entries sort by date, then by id
+
+    def __init__(self):
+        '''
+        Constructor function for the deadline index, that keeps the events sorted by their ending
+        date, so the events ending in a date range are found with two binary searches
+        '''
+
+        self.__entries = []
+
+    def __entry(self, endingOrdinal, eventId):
+        return (endingOrdinal << self.ID_BITS) | eventId
+
+    def build(self, endingOrdinals, eventIds):
+        '''
+        Function that rebuilds the index from all the events
+
+        Args:
+            endingOrdinals (iterable of ints): The ending dates of the events, as ordinals
+            eventIds (iterable of ints): The ids of the events, in the same order
+        '''
+
+        self.__entries = sorted(map(self.__entry, endingOrdinals, eventIds))
+
+    def add(self, endingOrdinal, eventId):
+        bisect.insort(self.__entries, self.__entry(endingOrdinal, eventId))
+
+    def remove(self, endingOrdinal, eventId):
+        entry = self.__entry(endingOrdinal, eventId)
+
+        position = bisect.bisect_left(self.__entries, entry)
+        if position < len(self.__entries) and self.__entries[position] == entry:
+            del self.__entries[position]
+
+    def __bounds(self, after, until):
+        start = 0 if after is None else bisect.bisect_left(self.__entries, (after + 1) << self.ID_BITS)
+        stop = len(self.__entries) if until is None else bisect.bisect_left(self.__entries, (until + 1) << self.ID_BITS)
+
+        return start, stop
+
+    def count_between(self, after, until):
+        '''
+        Function that returns the number of events that end after 'after' and until 'until'
+        (None for no limit), with two binary searches
+        '''
+
+        start, stop = self.__bounds(after, until)
+        return stop - start
+
+    def get_ids_between(self, after, until):
+        '''
+        Function that returns the ids of the events that end after 'after' and until 'until'
+
+        Args:
+            after (int): Date ordinal, None for no lower limit
+            until (int): Date ordinal, None for no upper limit
+
+        Returns:
+            (list of ints): The ids of the events, sorted by ending date, then by id
+        '''
+
+        start, stop = self.__bounds(after, until)
+
+        mask = (1 << self.ID_BITS) - 1
+        return [entry & mask for entry in self.__entries[start:stop]]
@@ -0,0 +1,335 @@
+from array import array
+import bisect
+import datetime
+import itertools
+
+class EventView:
+    __slots__ = ("__store", "__index")
+
+    def __init__(self, store, index):
+        '''
+        Constructor function for a lightweight view of the event at position 'index' of an
+        'EventStore', with the same functions as 'Event'. A view refers to a position, so it
+        shows another event after an event before it is deleted
+
+        Args:
+            store (EventStore object): The store that contains the event
+            index (int): The position of the event in the store
+        '''
+
+        self.__store = store
+        self.__index = index
+
+    def get_name(self):
+        return self.__store.get_name(self.__index)
+
+    def get_description(self):
+        return self.__store.get_description(self.__index)
+
+    def get_startingDate(self):
+        return self.__store.get_startingDate(self.__index)
+
+    def get_endingDate(self):
+        return self.__store.get_endingDate(self.__index)
+
+    def is_done(self):
+        return self.__store.is_done(self.__index)
+
+    def set_as_done(self):
+        self.__store.set_as_done(self.__index)
+
+class EventSelection:
+    __slots__ = ("__store", "__positions")
+
+    def __init__(self, store, positions):
+        '''
+        Constructor function for a sequence of some of the events of an 'EventStore', that creates
+        the views of the events only when they are read. Like a view, it refers to positions
+
+        Args:
+            store (EventStore object): The store that contains the events
+            positions (sequence of ints): The positions of the selected events, in their order
+        '''
+
+        self.__store = store
+        self.__positions = positions
+
+    def __len__(self):
+        return len(self.__positions)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return EventSelection(self.__store, self.__positions[index])
+
+        return EventView(self.__store, self.__positions[index])
+
+    def __iter__(self):
+        return map(EventView, itertools.repeat(self.__store), self.__positions)
+
+class EventStore:
+    def __init__(self):
+        '''
+        Constructor function for the compact event store, that keeps the events as columns
+        instead of one object per event:
+            - names and descriptions as UTF-8 text in a single string table, with arrays of offsets
+            - starting and ending dates as arrays of ordinals
+            - done flags as a bitset
+            - ids, increasing in the order of the events, that stay the same when other events are deleted
+        '''
+
+        self.__text = bytearray() #String table: the name of an event, followed by its description
+        self.__nameOffsets = array("Q")
+        self.__descriptionOffsets = array("Q")
+        self.__endOffsets = array("Q")
+        self.__unusedText = 0 #Bytes of the string table that belong to deleted events
+        self.__startingDates = array("i")
+        self.__endingDates = array("i")
+        self.__done = bytearray()
+        self.__ids = array("Q")
+        self.__nextId = 0
+        self.__count = 0
+
+    def __len__(self):
+        return self.__count
+
+    def __getitem__(self, index):
+        return EventView(self, self.__check_index(index))
+
+    def __iter__(self):
+        return (EventView(self, index) for index in range(self.__count))
+
+    def __check_index(self, index):
+        if index < 0:
+            index += self.__count
+        if not 0 <= index < self.__count:
+            raise IndexError("Event index out of range")
+
+        return index
+
+    def append(self, name, description, startingDate, endingDate, done):
+        '''
+        Function that adds an event at the end of the store
+
+        Args:
+            name (string): The name of the event
+            description (string): The description of the event
+            startingDate (datetime.date): The starting date of the event
+            endingDate (datetime.date): The ending date of the event
+            done (bool): If the event is done
+        '''
+
+        text = self.__text
+        self.__nameOffsets.append(len(text))
+        text += name.encode("utf-8")
+        self.__descriptionOffsets.append(len(text))
+        text += description.encode("utf-8")
+        self.__endOffsets.append(len(text))
+
+        self.__startingDates.append(startingDate.toordinal())
+        self.__endingDates.append(endingDate.toordinal())
+        self.__ids.append(self.__nextId)
+        self.__nextId += 1
+
+        if self.__count % 8 == 0:
+            self.__done.append(0)
+        self.__count += 1
+
+        if done:
+            self.set_as_done(self.__count - 1)
+
+    def append_event(self, event):
+        self.append(event.get_name(), event.get_description(), event.get_startingDate(), event.get_endingDate(), event.is_done())
+
+    def extend(self, columns):
+        '''
+        Function that adds many events at the end of the store
+
+        Args:
+            columns (tuple of lists): The (names, descriptions, startingDates, endingDates, dones) of the events
+        '''
+
+        names, descriptions, startingDates, endingDates, dones = columns
+        if not names:
+            return
+
+        #The whole batch is added column by column: one join for the string table, one extend for every array
+        pieces = [piece.encode("utf-8") for pair in zip(names, descriptions) for piece in pair]
+        offsets = list(itertools.accumulate(map(len, pieces), initial=len(self.__text)))
+
+        self.__text += b"".join(pieces)
+        self.__nameOffsets.extend(offsets[0:-1:2])
+        self.__descriptionOffsets.extend(offsets[1::2])
+        self.__endOffsets.extend(offsets[2::2])
+
+        self.__startingDates.extend(map(datetime.date.toordinal, startingDates))
+        self.__endingDates.extend(map(datetime.date.toordinal, endingDates))
+        self.__ids.extend(range(self.__nextId, self.__nextId + len(names)))
+        self.__nextId += len(names)
+
+        first = self.__count
+        self.__count += len(names)
+        self.__done.extend(bytes((self.__count + 7) // 8 - len(self.__done)))
+
+        for index in itertools.compress(range(first, self.__count), dones):
+            self.set_as_done(index)
+
+    def extend_encoded(self, text, nameOffsets, descriptionOffsets, endOffsets, startingOrdinals, endingOrdinals, dones):
+        '''
+        Function that adds many already encoded events at the end of the store, the strings
+        are not decoded
+
+        Args:
+            text (bytes-like): UTF-8 string table, the name of every event is followed by its description
+            nameOffsets, descriptionOffsets, endOffsets (sequences of ints): Offsets of the strings of the events in 'text'
+            startingOrdinals, endingOrdinals (sequences of ints): The dates of the events, as ordinals
+            dones (sequence of bools): The done flags of the events
+        '''
+
+        base = len(self.__text)
+        self.__text += text
+        self.__unusedText += len(text) - sum(map(int.__sub__, endOffsets, nameOffsets))
+
+        if base:
+            nameOffsets, descriptionOffsets, endOffsets = ([offset + base for offset in offsets] for offsets in (nameOffsets, descriptionOffsets, endOffsets))
+        self.__extend_column(self.__nameOffsets, nameOffsets)
+        self.__extend_column(self.__descriptionOffsets, descriptionOffsets)
+        self.__extend_column(self.__endOffsets, endOffsets)
+
+        self.__extend_column(self.__startingDates, startingOrdinals)
+        self.__extend_column(self.__endingDates, endingOrdinals)
+        self.__ids.extend(range(self.__nextId, self.__nextId + len(dones)))
+        self.__nextId += len(dones)
+
+        first = self.__count
+        self.__count += len(dones)
+        self.__done.extend(bytes((self.__count + 7) // 8 - len(self.__done)))
+
+        for index in itertools.compress(range(first, self.__count), dones):
+            self.set_as_done(index)
+
+    @staticmethod
+    def __extend_column(column, values):
+        #A view of the same type (of a memory mapped snapshot, for example) is copied at once, instead of value by value
+        if isinstance(values, memoryview) and values.format == column.typecode:
+            with values.cast("B") as raw:
+                column.frombytes(raw)
+        else:
+            column.extend(values)
+
+    def pop(self, index):
+        '''
+        Function that removes the event at position 'index'
+
+        Raises:
+            IndexError: If there is no event at position 'index'
+        '''
+
+        index = self.__check_index(index)
+
+        self.__unusedText += self.__endOffsets[index] - self.__nameOffsets[index]
+        self.__nameOffsets.pop(index)
+        self.__descriptionOffsets.pop(index)
+        self.__endOffsets.pop(index)
+        self.__startingDates.pop(index)
+        self.__endingDates.pop(index)
+        self.__ids.pop(index)
+
+        #The done flags after 'index' move one bit to the left
+        bits = int.from_bytes(self.__done, "little")
+        bits = (bits & ((1 << index) - 1)) | ((bits >> (index + 1)) << index)
+        self.__count -= 1
+        self.__done = bytearray(bits.to_bytes((self.__count + 7) // 8, "little"))
+
+        if self.__unusedText > len(self.__text) // 2:
+            self.__compact_text()
+
+    def truncate(self, count):
+        '''
+        Function that removes the events after the first 'count' ones, for example the events appended
+        by a batch that couldn't be completed
+        '''
+
+        if count >= self.__count:
+            return
+
+        #The removed events were appended last, so their text is at the end of the string table
+        del self.__text[self.__nameOffsets[count]:]
+        self.__unusedText = min(self.__unusedText, len(self.__text))
+
+        for column in (self.__nameOffsets, self.__descriptionOffsets, self.__endOffsets, self.__startingDates, self.__endingDates, self.__ids):
+            del column[count:]
+
+        self.__count = count
+        del self.__done[(count + 7) // 8:]
+        if count & 7:
+            self.__done[-1] &= (1 << (count & 7)) - 1
+
+    def __compact_text(self):
+        '''
+        Function that rebuilds the string table without the text of the deleted events
+        '''
+
+        text = bytearray()
+        nameOffsets, descriptionOffsets, endOffsets = array("Q"), array("Q"), array("Q")
+
+        for start, middle, end in zip(self.__nameOffsets, self.__descriptionOffsets, self.__endOffsets):
+            nameOffsets.append(len(text))
+            descriptionOffsets.append(len(text) + middle - start)
+            text += self.__text[start:end]
+            endOffsets.append(len(text))
+
+        self.__text = text
+        self.__nameOffsets, self.__descriptionOffsets, self.__endOffsets = nameOffsets, descriptionOffsets, endOffsets
+        self.__unusedText = 0
+
+    def get_name(self, index):
+        return self.__text[self.__nameOffsets[index]:self.__descriptionOffsets[index]].decode("utf-8")
+
+    def get_description(self, index):
+        return self.__text[self.__descriptionOffsets[index]:self.__endOffsets[index]].decode("utf-8")
+
+    def get_startingDate(self, index):
+        return datetime.date.fromordinal(self.__startingDates[index])
+
+    def get_endingDate(self, index):
+        return datetime.date.fromordinal(self.__endingDates[index])
+
+    def get_endingOrdinals(self):
+        '''
+        Function that returns the ending dates of all the events, as an array of ordinals
+        '''
+
+        return self.__endingDates
+
+    def get_endingOrdinal(self, index):
+        return self.__endingDates[index]
+
+    def get_ids(self):
+        '''
+        Function that returns the ids of all the events, as an increasing array
+        '''
+
+        return self.__ids
+
+    def get_id(self, index):
+        return self.__ids[index]
+
+    def find(self, eventId):
+        '''
+        Function that returns the position of the event with the id 'eventId'
+
+        Raises:
+            KeyError: If there is no event with the id 'eventId'
+        '''
+
+        index = bisect.bisect_left(self.__ids, eventId)
+        if index == self.__count or self.__ids[index] != eventId:
+            raise KeyError(eventId)
+
+        return index
+
+    def is_done(self, index):
+        return bool(self.__done[index >> 3] & (1 << (index & 7)))
+
+    def set_as_done(self, index):
+        self.__done[index >> 3] |= 1 << (index & 7)
@@ -0,0 +1,307 @@
+import csv
+import datetime
+import json
+import os
+
+#Every reader yields the records of a file one at a time, as dicts with the keys:
+#"position" (line of the record, for error messages), "name", "description",
+#"startingDate" and "endingDate" (iso-format strings), "done" (bool, or a string like "True"),
+#or only "position" and "error" for a record that couldn't be read
+FIELDS = ["name", "description", "startingDate", "endingDate", "done"]
+
+def read_csv(file):
+    '''
+    Function that reads events from a CSV file with a header row, the columns are
+    name, description, startingDate, endingDate and (optionally) done
+
+    Args:
+        file (file object): The opened file (opened with newline="")
+
+    Raises:
+        ValueError: If the header is missing a column
+
+    Returns:
+        (iterator of dicts): The records of the file
+    '''
+
+    reader = csv.DictReader(file)
+
+    missing = [field for field in FIELDS[:4] if field not in (reader.fieldnames or [])]
+    if missing:
+        raise ValueError(f"The CSV header needs the columns: {', '.join(FIELDS)} (missing {', '.join(missing)})")
+
+    for row in reader:
+        yield {
+            "position": reader.line_num,
+            "name": row["name"] or "",
+            "description": row["description"] or "",
+            "startingDate": row["startingDate"] or "",
+            "endingDate": row["endingDate"] or "",
+            "done": row.get("done") or False
+        }
+
+def read_json_lines(file):
+    '''
+    Function that reads events from a JSON lines file, one object with the keys name,
+    description, startingDate, endingDate and (optionally) done on every line
+
+    Returns:
+        (iterator of dicts): The records of the file, a line that isn't an object gives a record without fields
+    '''
+
+    for position, line in enumerate(file, 1):
+        if not line.strip():
+            continue
+
+        try:
+            value = json.loads(line)
+        except ValueError:
+            value = None
+
+        if not isinstance(value, dict):
+            yield {"position": position, "error": "Not a JSON object"}
+            continue
+
+        yield {
+            "position": position,
+            "name": str(value.get("name", "")),
+            "description": str(value.get("description", "")),
+            "startingDate": str(value.get("startingDate", "")),
+            "endingDate": str(value.get("endingDate", "")),
+            "done": value.get("done", False)
+        }
+
+def _unfold_lines(file):
+    '''
+    Function that joins the folded lines of an iCalendar file (a line that starts with a space or
+    a tab continues the previous one)
+
+    Returns:
+        (iterator of tuples): (position, line) pairs, the position is the line of the file where the content line starts
+    '''
+
+    current, position = None, 0
+
+    for number, line in enumerate(file, 1):
+        line = line.rstrip("\r\n")
+
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+
+        if current is not None:
+            yield position, current
+        current, position = line, number
+
+    if current is not None:
+        yield position, current
+
+def _unescape_text(value):
+    result, escaped = [], False
+
+    for character in value:
+        if escaped:
+            result.append("\n" if character in "nN" else character)
+            escaped = False
+        elif character == "\\":
+            escaped = True
+        else:
+            result.append(character)
+
+    return "".join(result)
+
+def _parse_ics_date(value, parameters):
+    '''
+    Function that converts an iCalendar DATE or DATE-TIME value to a date
+
+    Returns:
+        (tuple): The date and True if the value was a DATE (a whole day)
+    '''
+
+    if "VALUE=DATE" in parameters or len(value) == 8:
+        return datetime.datetime.strptime(value[:8], "%Y%m%d").date(), True
+
+    return datetime.datetime.strptime(value[:15], "%Y%m%dT%H%M%S").date(), False
+
+def read_ics(file):
+    '''
+    Function that reads events from an iCalendar file: every VEVENT (SUMMARY, DESCRIPTION, DTSTART,
+    DTEND) and every VTODO (SUMMARY, DESCRIPTION, DTSTART, DUE, STATUS:COMPLETED) is a record
+
+    The end of an all day event is exclusive in iCalendar, so the ending date is the day before it.
+    A component without a description uses its summary, and one without a start starts when it ends
+
+    Returns:
+        (iterator of dicts): The records of the file
+    '''
+
+    component, properties, position = None, {}, 0
+
+    for number, line in _unfold_lines(file):
+        name, _, value = line.partition(":")
+        name, *parameters = name.split(";")
+        name = name.upper()
+
+        if name == "BEGIN" and value.upper() in ("VEVENT", "VTODO"):
+            component, properties, position = value.upper(), {}, number
+        elif name == "END" and component is not None and value.upper() == component:
+            yield _ics_record(component, properties, position)
+            component = None
+        elif component is not None:
+            properties[name] = (value, [parameter.upper() for parameter in parameters])
+
+def _ics_record(component, properties, position):
+    record = {"position": position}
+
+    try:
+        summary = _unescape_text(properties.get("SUMMARY", ("", []))[0])
+        endName = "DTEND" if component == "VEVENT" else "DUE"
+
+        if endName in properties:
+            endingDate, wholeDay = _parse_ics_date(*properties[endName])
+            if wholeDay and component == "VEVENT":
+                endingDate -= datetime.timedelta(days=1)
+        elif "DTSTART" in properties:
+            endingDate = _parse_ics_date(*properties["DTSTART"])[0]
+        else:
+            raise ValueError(f"The {component} has no {endName} or DTSTART")
+
+        startingDate = _parse_ics_date(*properties["DTSTART"])[0] if "DTSTART" in properties else endingDate
+    except ValueError as e:
+        record["error"] = str(e)
+        return record
+
+    record.update({
+        "name": summary,
+        "description": _unescape_text(properties["DESCRIPTION"][0]) if "DESCRIPTION" in properties else summary,
+        "startingDate": startingDate.isoformat(),
+        "endingDate": max(startingDate, endingDate).isoformat(),
+        "done": properties.get("STATUS", ("", []))[0].upper() == "COMPLETED" or "COMPLETED" in properties
+    })
+
+    return record
+
+def write_csv(file, events):
+    writer = csv.writer(file)
+    writer.writerow(FIELDS)
+
+    for event in events:
+        writer.writerow([event.get_name(), event.get_description(), event.get_startingDate().isoformat(), event.get_endingDate().isoformat(), event.is_done()])
+
+def write_json_lines(file, events):
+    for event in events:
+        file.write(json.dumps({
+            "name": event.get_name(),
+            "description": event.get_description(),
+            "startingDate": event.get_startingDate().isoformat(),
+            "endingDate": event.get_endingDate().isoformat(),
+            "done": event.is_done()
+        }) + "\n")
+
+def _escape_text(value):
+    return value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+def _fold_line(line):
+    '''
+    Function that folds a content line to lines of at most 75 characters, as iCalendar requires
+    '''
+
+    parts = [line[:75]]
+    parts.extend(" " + line[i:i + 74] for i in range(75, len(line), 74))
+
+    return "\r\n".join(parts) + "\r\n"
+
+def write_ics(file, events):
+    '''
+    Function that writes the events as all day VTODO components, which keep the done state
+    '''
+
+    stamp = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    file.write("BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//TO-DO Background Changer//EN\r\n")
+
+    for index, event in enumerate(events):
+        file.write("BEGIN:VTODO\r\n")
+        file.write(f"UID:{stamp}-{index}@todo-background-changer\r\n")
+        file.write(f"DTSTAMP:{stamp}\r\n")
+        file.write(_fold_line("SUMMARY:" + _escape_text(event.get_name())))
+        file.write(_fold_line("DESCRIPTION:" + _escape_text(event.get_description())))
+        file.write(f"DTSTART;VALUE=DATE:{event.get_startingDate().strftime('%Y%m%d')}\r\n")
+        file.write(f"DUE;VALUE=DATE:{event.get_endingDate().strftime('%Y%m%d')}\r\n")
+        file.write("STATUS:COMPLETED\r\n" if event.is_done() else "STATUS:NEEDS-ACTION\r\n")
+        file.write("END:VTODO\r\n")
+
+    file.write("END:VCALENDAR\r\n")
+
+#Reader and writer of every supported extension
+FORMATS = {
+    ".csv": (read_csv, write_csv),
+    ".jsonl": (read_json_lines, write_json_lines),
+    ".ndjson": (read_json_lines, write_json_lines),
+    ".ics": (read_ics, write_ics)
+}
+
+def get_format(path):
+    '''
+    Function that returns the reader and the writer for the file 'path', from its extension
+
+    Raises:
+        ValueError: If the extension is not supported
+    '''
+
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f"Unsupported file type '{extension}', the supported ones are: {', '.join(FORMATS)}")
+
+    return FORMATS[extension]
+
+def read_events(path):
+    '''
+    Function that streams the records of the file 'path', the format is given by its extension.
+    The format is checked and the file is opened right away, only the records are read lazily
+
+    Raises:
+        ValueError: If the extension is not supported
+        OSError: If the file can't be opened
+
+    Returns:
+        (iterator of dicts): The records of the file, see FIELDS
+    '''
+
+    reader = get_format(path)[0]
+    file = open(path, "r", encoding="utf-8", newline="")
+
+    def records():
+        with file:
+            yield from reader(file)
+
+    return records()
+
+def write_events(path, events):
+    '''
+    Function that streams the events to the file 'path', the format is given by its extension.
+    The file is written to a temporary file first, which then replaces 'path'
+
+    Returns:
+        (int): The number of written events
+    '''
+
+    writer = get_format(path)[1]
+    count = 0
+
+    def counted():
+        nonlocal count
+        for event in events:
+            count += 1
+            yield event
+
+    temporaryPath = path + ".tmp"
+    try:
+        with open(temporaryPath, "w", encoding="utf-8", newline="") as file:
+            writer(file, counted())
+        os.replace(temporaryPath, path)
+    except BaseException:
+        if os.path.exists(temporaryPath):
+            os.remove(temporaryPath)
+        raise
+
+    return count
@@ -0,0 +1,104 @@
+import datetime
+import itertools
+
+CHUNK_SIZE = 1024 * 1024 #Characters read from the data file at once
+FIELDS = 5 #Fields of a row: name, description, starting date, ending date, done
+
+def read_event_columns(filename, skipBefore, chunkSize = CHUNK_SIZE):
+    '''
+    Function that reads the events data file in large chunks and parses every chunk as columns
+
+    Rows of events that are done and ended before 'skipBefore' are dropped before any object is
+    created for them. Every distinct date string is parsed only once, the data files repeat
+    the same dates on many rows
+
+    Event example in data file: "Title,Description,%Y-%m-%d,%Y-%m-%d,True/False"
+
+    Args:
+        filename (string): Path of the data file
+        skipBefore (datetime.date): Done events that ended before this date are dropped
+        chunkSize (int): Number of characters read at once
+
+    Returns:
+        (generator of tuples): Batches of (names, descriptions, startingDates, endingDates, dones) columns, in file order
+    '''
+
+    dates = {} #Date string -> datetime.date
+    remainder = ""
+
+    with open(filename, "r") as file:
+        while True:
+            chunk = file.read(chunkSize)
+            if not chunk:
+                break
+
+            #The last line may continue in the next chunk
+            end = chunk.rfind("\n") + 1
+            lines = remainder + chunk[:end]
+            remainder = chunk[end:]
+
+            if lines:
+                yield _parse_chunk(lines, skipBefore, dates)
+
+    if remainder:
+        yield _parse_chunk(remainder + "\n", skipBefore, dates)
+
+def _parse_chunk(lines, skipBefore, dates):
+    '''
+    Function that parses complete lines of the data file
+
+    When every line has exactly 5 fields and a valid done field, the chunk is split once and each
+    column is a slice of the fields list, so the splitting and the date lookups run over whole
+    columns. Otherwise (blank lines, extra commas, trailing spaces) the lines are parsed one by one
+    '''
+
+    fields = lines.replace("\n", ",").split(",")
+    fields.pop() #The empty string after the last newline
+
+    doneStrs = fields[4::FIELDS]
+    if len(fields) != FIELDS * lines.count("\n") or not set(doneStrs) <= {"True", "False"}:
+        return _parse_lines(lines.split("\n"), skipBefore, dates)
+
+    names = fields[0::FIELDS]
+    descriptions = fields[1::FIELDS]
+    startingDateStrs = fields[2::FIELDS]
+    endingDateStrs = fields[3::FIELDS]
+    dones = [done == "True" for done in doneStrs]
+
+    for dateStr in set(startingDateStrs).union(endingDateStrs).difference(dates):
+        dates[dateStr] = datetime.date.fromisoformat(dateStr)
+
+    columns = (names, descriptions, list(map(dates.__getitem__, startingDateStrs)), list(map(dates.__getitem__, endingDateStrs)), dones)
+
+    keep = [not (done and skipBefore > endingDate) for done, endingDate in zip(dones, columns[3])]
+    if not all(keep):
+        columns = tuple(list(itertools.compress(column, keep)) for column in columns)
+
+    return columns
+
+def _parse_lines(lines, skipBefore, dates):
+    rows = []
+    parse_date = datetime.date.fromisoformat
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+
+        name, description, startingDateStr, endingDateStr, doneStr = line.split(",")[:FIELDS]
+
+        endingDate = dates.get(endingDateStr)
+        if endingDate is None:
+            endingDate = dates[endingDateStr] = parse_date(endingDateStr)
+
+        done = doneStr == "True"
+        if done and skipBefore > endingDate:
+            continue
+
+        startingDate = dates.get(startingDateStr)
+        if startingDate is None:
+            startingDate = dates[startingDateStr] = parse_date(startingDateStr)
+
+        rows.append((name, description, startingDate, endingDate, done))
+
+    return tuple(map(list, zip(*rows))) if rows else ([], [], [], [], [])
@@ -1,20 +1,55 @@
+from array import array
 import datetime
+import gc
+import itertools
+import json
+import os
 from ..DOMAIN.event import Event
 from ..utils import EventsRepoError
+from .eventsLoader import read_event_columns
+from .eventStore import EventSelection, EventStore
+from .deadlineIndex import DeadlineIndex
+from .eventsSnapshot import read_snapshot_columns, write_snapshot
+from .fileLock import FileLock
 
 class EventsRepo:
-    def __init__(self, filename):
+    BINARY_EXTENSION = ".bin" #Data files with this extension use the binary snapshot format instead of the text format
+    JOURNAL_SUFFIX = ".journal"
+    LOCK_SUFFIX = ".lock"
+    COMPACTION_THRESHOLD = 1000 #Number of journal records after which the journal is merged back into the data file
+
+    def __init__(self, filename, compactionThreshold = COMPACTION_THRESHOLD, writeBehind = False):
         '''
         Constructor function for repo object
-        
+
+        Several processes can use the same data file: every write holds a lock shared by all of them,
+        and the events are reloaded whenever another process changed the files (which is noticed
+        with a few cheap checks, before every access)
+
         Args:
-            filename (string): Path of the file that will be used to store the data
+            filename (string): Path of the file that will be used to store the data (text format, or binary snapshot for '.bin' files)
+            compactionThreshold (int): Number of journal records after which the journal is compacted into the data file
+            writeBehind (bool): If True, the changes are kept in memory until 'flush' writes them all at once, instead of after every change
         '''
 
-        self.__events = []
+        self.__events = EventStore()
+        self.__deadlines = DeadlineIndex() #The events sorted by their ending date
         self.__filename = filename
+        self.__binary = os.path.splitext(filename)[1].lower() == self.BINARY_EXTENSION
+        self.__journalFilename = filename + self.JOURNAL_SUFFIX
+        self.__compactionThreshold = compactionThreshold
+        self.__journalRecords = 0
+        self.__writeBehind = writeBehind
+        #Journal records not written yet, as (record, target) pairs: the target of a "done" or "delete" record is the
+        #event it changes, so the record can be applied again on top of the changes of another process
+        self.__pendingRecords = []
+        self.__loadDate = datetime.date.today() #The date used to skip expired events, the journal indexes are relative to it
+        self.__lock = FileLock(filename + self.LOCK_SUFFIX)
+        self.__signature = None #The state of the files when they were read or written last
 
-        self.__load_from_file() #When creating the object, we load the saved content into the program
+        #When creating the object, we load the saved content into the program
+        with self.__lock:
+            self.__reload()
 
     def get_events(self):
         '''
@@ -24,95 +59,500 @@ class EventsRepo:
             EventsRepoError: if there are no stored existing events yet
 
         Returns:
-            A list of all of the current stored objects of type 'Event'
+            (EventStore object): A sequence of all of the current stored events
         '''
 
+        self.__refresh()
+
         if not self.__events:
             raise EventsRepoError("No existing events yet!")
-        
+
         return self.__events
 
+    def get_events_by_deadline(self, boundaries):
+        '''
+        Function that splits the events by their ending date
+
+        Args:
+            boundaries (list of datetime.date): Sorted dates, the group 'i' contains the events that end after boundaries[i-1] and until boundaries[i]
+
+        Returns:
+            (list of sequences): len(boundaries) + 1 sequences of events (read lazily, like 'get_events'), each one in the order of 'get_events'
+        '''
+
+        self.__refresh()
+
+        limits = [None] + [boundary.toordinal() for boundary in boundaries] + [None]
+        ranges = list(zip(limits, limits[1:]))
+
+        #Every limit is a binary search in the deadline index. The ids of the smaller groups are mapped
+        #to positions, the largest group (usually the events far from their deadline) is every other
+        #position, taken in one pass without looking its ids up
+        counts = [self.__deadlines.count_between(after, until) for after, until in ranges]
+        largest = counts.index(max(counts))
+
+        inLargest = bytearray(b"\x01") * len(self.__events)
+        groups = []
+        for group, (after, until) in enumerate(ranges):
+            positions = []
+            if group != largest:
+                positions = sorted(map(self.__events.find, self.__deadlines.get_ids_between(after, until)))
+                for position in positions:
+                    inLargest[position] = 0
+
+            groups.append(positions)
+
+        groups[largest] = array("Q", itertools.compress(range(len(self.__events)), inLargest))
+
+        return [EventSelection(self.__events, positions) for positions in groups]
+
     def delete_event(self, index):
         '''
         Function that deletes the event with the index 'index'
-        
+
         Args:
             index (int): The index of the element that will be deleted
         '''
 
-        self.__events.pop(index)
+        with self.__lock:
+            self.__refresh()
+
+            target = self.__get_target(index)
+            self.__deadlines.remove(self.__events.get_endingOrdinal(index), self.__events.get_id(index))
+            self.__events.pop(index)
+
+            self.__append_to_journal(f"delete,{index}", target)
 
     def mark_as_done(self, index):
         '''
         Function that sets the event at position 'index' as done
         '''
 
-        self.__events[index].set_as_done()
+        with self.__lock:
+            self.__refresh()
 
-        self.__load_to_file()
+            self.__events[index].set_as_done()
 
-    def __load_from_file(self):
+            self.__append_to_journal(f"done,{index}", self.__get_target(index))
+
+    def add_event(self, event):
         '''
-        Function that loads the content of the stored data file into the program by parsing the
-        data and creating objects of type 'Event' with the corresponding information
+        Function that adds the event 'event' to the list of events, then records
+        the change in the journal
 
-        Event example in data file: "Title,Description,%d/%m/%Y,%d/%m/%Y"
+        Args:
+            event (event object): The event that needs to be added to the list
         '''
 
-        with open(self.__filename, "r") as file:
-            line = file.readline()
+        with self.__lock:
+            self.__refresh()
+
+            self.__events.append_event(event)
+            self.__deadlines.add(self.__events.get_endingOrdinal(-1), self.__events.get_id(-1))
+            #Saving the change to the journal instead of rewriting the data file
+            self.__append_to_journal(self.__event_to_record(event))
 
-            while line:
-                line = line.strip()
-                line = line.split(",")
+    def add_events(self, events):
+        '''
+        Function that adds all the events from 'events' to the list of events, then records them in
+        the journal with a single write. If 'events' raises an exception, none of its events are added
 
-                name = line[0]
-                description = line[1]
+        Args:
+            events (iterable of event objects): The events that need to be added
+        '''
 
-                date1 = datetime.date.fromisoformat(line[2])
-                
-                date2 = datetime.date.fromisoformat(line[3])
+        with self.__lock:
+            self.__refresh()
 
-                done = line[4] == "True"
+            count = len(self.__events)
+            pendingCount = len(self.__pendingRecords)
+            try:
+                for event in events:
+                    self.__events.append_event(event)
+                    self.__pendingRecords.append((self.__event_to_record(event), None))
+            except BaseException:
+                #The events read before the error are dropped, so the import can be run again once the input is fixed
+                self.__events.truncate(count)
+                del self.__pendingRecords[pendingCount:]
+                raise
+
+            if len(self.__events) == count:
+                return
+
+            #A single sort is faster than an insertion for every event
+            self.__rebuild_deadlines()
+
+            if not self.__writeBehind:
+                self.flush()
+
+    def compact(self):
+        '''
+        Function that merges the journal back into the data file: the current events are
+        written to a temporary file that atomically replaces the data file, then the
+        journal is removed
+        '''
+
+        with self.__lock:
+            self.__refresh()
+
+            self.__loadDate = datetime.date.today()
+
+            events = EventStore()
+            for el in self.__events:
+                if not self.__is_expired(el): events.append_event(el)
+            self.__events = events
+            self.__rebuild_deadlines()
 
-                if done and datetime.date.today() > date2:
-                    line = file.readline()
+            self.__load_to_file()
+
+            if os.path.exists(self.__journalFilename):
+                os.remove(self.__journalFilename)
+            self.__journalRecords = 0
+            self.__pendingRecords = [] #Already part of the new data file
+
+            self.__lock.increase_generation()
+            self.__signature = self.__read_signature()
+
+    def close(self):
+        '''
+        Function that writes the pending changes, then releases the lock file
+        '''
+
+        self.flush()
+        self.__lock.close()
+
+    def __read_signature(self):
+        '''
+        Function that returns what identifies the current state of the files: the generation counter
+        that every write increases, then the size, modification time and inode of the data file and of
+        the journal. The counter tells apart writes that the clock can't (in the same tick, or a file
+        replaced by one of the same size)
+        '''
+
+        signature = [self.__lock.get_generation()]
+
+        for filename in (self.__filename, self.__journalFilename):
+            try:
+                stat = os.stat(filename)
+                signature.append((stat.st_size, stat.st_mtime_ns, stat.st_ino))
+            except FileNotFoundError:
+                signature.append(None)
+
+        return tuple(signature)
+
+    def __refresh(self):
+        '''
+        Function that reloads the events if another process changed the files since this object read
+        or wrote them last. The pending changes are applied again on top of the new events
+        '''
+
+        if self.__read_signature() == self.__signature:
+            return
+
+        with self.__lock:
+            if self.__read_signature() == self.__signature:
+                return #Reloaded while waiting for the lock
+
+            pendingRecords = self.__pendingRecords
+            self.__reload()
+            self.__rebase(pendingRecords)
+
+    def __reload(self):
+        '''
+        Function that loads the events from the files again, the lock must be held
+        '''
+
+        self.__signature = self.__read_signature() #A compaction while loading must not reload again
+        self.__events = EventStore()
+        self.__journalRecords = 0
+        self.__pendingRecords = []
+        self.__loadDate = datetime.date.today()
+
+        self.__load_from_file()
+
+        self.__signature = self.__read_signature()
+
+    def __get_target(self, index):
+        return (self.__events.get_name(index), self.__events.get_description(index), self.__events.get_startingDate(index), self.__events.get_endingDate(index))
+
+    def __find_target(self, target):
+        '''
+        Function that returns the index of the first event described by 'target', or None if there is none
+        '''
+
+        for index in range(len(self.__events)):
+            if self.__get_target(index) == target:
+                return index
+
+        return None
+
+    def __rebase(self, pendingRecords):
+        '''
+        Function that applies the pending records again after a reload: the added events are added
+        again, and the other records are written again for the new index of their event (or dropped,
+        if another process already deleted it)
+        '''
+
+        for record, target in pendingRecords:
+            if target is not None:
+                index = self.__find_target(target)
+                if index is None:
                     continue
+                record = f"{record.partition(',')[0]},{index}"
+
+            self.__apply_record(record)
+            self.__pendingRecords.append((record, target))
+
+        if pendingRecords:
+            self.__rebuild_deadlines()
+
+    def __rebuild_deadlines(self):
+        self.__deadlines.build(self.__events.get_endingOrdinals(), self.__events.get_ids())
+
+    def __is_expired(self, event):
+        return event.is_done() and self.__loadDate > event.get_endingDate()
+
+    @staticmethod
+    def __parse_event(line):
+        '''
+        Function that creates an object of type 'Event' from a line of the data file
+
+        Args:
+            line (string): A line of the data file, without the trailing newline
+
+        Returns:
+            (Event object): The parsed event
+        '''
+
+        line = line.split(",")
+
+        event = Event(line[0], line[1], datetime.date.fromisoformat(line[2]), datetime.date.fromisoformat(line[3]))
+        if line[4] == "True": event.set_as_done()
+
+        return event
+
+    @staticmethod
+    def __event_to_line(event):
+        '''
+        Function that transforms an event into a string that can be parsed back to an
+        object of type 'Event'
+
+        Event example in data file: "Title,Description,%Y-%m-%d,%Y-%m-%d,True/False"
+        '''
+
+        name = event.get_name()
+        description = event.get_description()
+        startingDateStr = event.get_startingDate().strftime("%Y-%m-%d")
+        endingDateStr = event.get_endingDate().strftime("%Y-%m-%d")
+        done = "True" if event.is_done() == True else "False"
+
+        return name + "," + description + "," + startingDateStr + "," + endingDateStr + "," + done
+
+    @staticmethod
+    def __event_to_record(event):
+        '''
+        Function that returns the journal record that adds the event 'event', the event is
+        written as JSON so commas and newlines are kept
+        '''
+
+        return "add," + json.dumps([event.get_name(), event.get_description(), event.get_startingDate().isoformat(), event.get_endingDate().isoformat(), event.is_done()])
+
+    def __snapshot_signature(self):
+        '''
+        Function that returns the size and modification time of the data file, used to
+        check that a journal was written on top of the current data file
+        '''
+
+        stat = os.stat(self.__filename)
+        return f"{stat.st_size},{stat.st_mtime_ns}"
 
-                event = Event(name, description, date1, date2)
-                if done: event.set_as_done()
+    def __read_journal(self):
+        '''
+        Function that reads the complete records of the journal
+
+        A journal starts with a header "#journal,size,mtime,loadDate" that describes the data file it
+        was written on top of. If the data file doesn't match the header (for example because the
+        program stopped after a compaction, but before the journal was removed), the journal is ignored.
+        A stale journal is removed (the lock must be held). A last record without a trailing newline was
+        interrupted while being written, so it is ignored too, and cut from the file (the next record would
+        be appended right after it otherwise)
+
+        Raises:
+            EventsRepoError: If the header matches the data file but its load date is missing or damaged
+
+        Returns:
+            (list of strings): The journal records, or None if there is no valid journal
+        '''
+
+        if not os.path.exists(self.__journalFilename):
+            return None
+
+        with open(self.__journalFilename, "r") as file:
+            content = file.read()
+
+        if not content.endswith("\n"):
+            self.__truncate_journal(content[:content.rfind("\n") + 1])
+
+        lines = content.split("\n")[:-1] #The last element is either empty or an incomplete record
+        header = lines[0].split(",") if lines else []
 
-                self.__events.append(event)
+        if header[:1] != ["#journal"] or ",".join(header[1:3]) != self.__snapshot_signature():
+            os.remove(self.__journalFilename) #A stale journal, new records can't be appended to it
+            return None
 
-                line = file.readline()
+        try:
+            self.__loadDate = datetime.date.fromisoformat(header[3])
+        except (IndexError, ValueError) as e:
+            raise EventsRepoError(f"The header of the journal '{self.__journalFilename}' is damaged ({e}), fix or remove it to load the events!")
+
+        return lines[1:]
+
+    def __truncate_journal(self, content):
+        '''
+        Function that replaces the journal with 'content', its complete records, through a temporary file
+        '''
+
+        temporaryFilename = self.__journalFilename + ".tmp"
+
+        with open(temporaryFilename, "w") as file:
+            file.write(content)
+            file.flush()
+            os.fsync(file.fileno())
+
+        os.replace(temporaryFilename, self.__journalFilename)
+
+    def __apply_record(self, record):
+        '''
+        Function that applies a journal record ("add,<JSON [name, description, startingDate, endingDate, done]>",
+        "done,<index>" or "delete,<index>")
+        to the list of events
+        '''
+
+        operation, _, argument = record.partition(",")
+
+        if operation == "add" and argument.startswith("["):
+            name, description, startingDate, endingDate, *done = json.loads(argument) #Records without the done flag add events that are not done
+            self.__events.append(name, description, datetime.date.fromisoformat(startingDate), datetime.date.fromisoformat(endingDate), bool(done and done[0]))
+        elif operation == "add":
+            self.__events.append_event(self.__parse_event(argument)) #Record written in the text format, by an older version
+        elif operation == "done":
+            self.__events[int(argument)].set_as_done()
+        elif operation == "delete":
+            self.__events.pop(int(argument))
+        else:
+            raise ValueError(f"Unknown journal record '{record}'")
+
+    def __append_to_journal(self, record, target = None):
+        '''
+        Function that adds a record to the journal, right away or (with write-behind) on the next flush
+
+        Args:
+            record (string): The record that will be appended
+            target (tuple): The name, description, starting and ending date of the event changed by a "done" or "delete" record
+        '''
+
+        self.__pendingRecords.append((record, target))
+
+        if not self.__writeBehind:
+            self.flush()
+
+    def flush(self):
+        '''
+        Function that appends the pending records to the journal with a single write, creating the
+        journal (and its header) if needed. If the journal would become too long, it is compacted instead
+
+        If another process changed the files since they were read, the events are reloaded first and the
+        pending records are applied on top of them
+        '''
+
+        if not self.__pendingRecords:
+            return
+
+        with self.__lock:
+            self.__refresh()
+            if not self.__pendingRecords:
+                return #Every pending record changed an event that another process deleted
+
+            #Writing the records to the journal would only be followed by a compaction
+            if self.__journalRecords + len(self.__pendingRecords) >= self.__compactionThreshold:
+                self.compact()
+                return
+
+            content = "\n".join(record for record, _ in self.__pendingRecords) + "\n"
+            if not os.path.exists(self.__journalFilename):
+                self.__journalRecords = 0
+                content = f"#journal,{self.__snapshot_signature()},{self.__loadDate.isoformat()}\n" + content
+
+            with open(self.__journalFilename, "a") as file:
+                file.write(content)
+                file.flush()
+                os.fsync(file.fileno())
+
+            self.__journalRecords += len(self.__pendingRecords)
+            self.__pendingRecords = []
+
+            self.__lock.increase_generation()
+            self.__signature = self.__read_signature()
+
+    def __load_from_file(self):
+        '''
+        Function that loads the content of the stored data file into the program by parsing the
+        data and creating objects of type 'Event' with the corresponding information, then replays
+        the journal on top of it
+
+        Event example in data file: "Title,Description,%Y-%m-%d,%Y-%m-%d,True/False"
+
+        Raises:
+            EventsRepoError: If a record of the journal is damaged (the records after it can't be applied without it)
+        '''
+
+        records = self.__read_journal()
+
+        #Creating many objects at once triggers the garbage collector over and over, while none of them can be garbage
+        gcEnabled = gc.isenabled()
+        gc.disable()
+        try:
+            if self.__binary:
+                for columns in read_snapshot_columns(self.__filename, self.__loadDate):
+                    self.__events.extend_encoded(*columns)
+            else:
+                for columns in read_event_columns(self.__filename, self.__loadDate):
+                    self.__events.extend(columns)
+        finally:
+            if gcEnabled: gc.enable()
+
+        for line, record in enumerate(records or [], 2):
+            try:
+                self.__apply_record(record)
+            except (ValueError, IndexError) as e:
+                raise EventsRepoError(f"The line {line} of the journal '{self.__journalFilename}' is damaged ({e}), fix or remove it to load the events!")
+
+            self.__journalRecords += 1
+
+        self.__rebuild_deadlines()
+
+        if self.__journalRecords >= self.__compactionThreshold:
+            self.compact()
 
     def __load_to_file(self):
         '''
         Function that loads the current events from the events list to the data file by
         transforming the data into a string that can be parsed back to an object of type
-        'Event'
+        'Event'. The data is written to a temporary file first, which then replaces the data file
 
-        Event example in data file: "Title,Description,%d/%m/%Y,%d/%m/%Y"
+        Event example in data file: "Title,Description,%Y-%m-%d,%Y-%m-%d,True/False"
         '''
 
-        with open(self.__filename, "w") as file:
+        if self.__binary:
+            write_snapshot(self.__filename, self.__events)
+            return
+
+        temporaryFilename = self.__filename + ".tmp"
+
+        with open(temporaryFilename, "w") as file:
             for el in self.__events:
-                name = el.get_name()
-                description = el.get_description()
-                startingDateStr = el.get_startingDate().strftime("%Y-%m-%d")
-                endingDateStr = el.get_endingDate().strftime("%Y-%m-%d")
-                done = "True" if el.is_done() == True else "False"
-
-                file.write(name + "," + description + "," + startingDateStr + "," + endingDateStr + "," + done + "\n")
-    
-    def add_event(self, event):
-        '''
-        Function that adds the event 'event' to the list of events, then updates the
-        date file by calling the '__load_to_file' function
-        
-        Args:
-            event (event object): The event that needs to be added to the list
-        '''
+                file.write(self.__event_to_line(el) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
 
-        self.__events.append(event)
-        self.__load_to_file() #Saving the current content to the data file after modifying it
\ No newline at end of file
+        os.replace(temporaryFilename, self.__filename)
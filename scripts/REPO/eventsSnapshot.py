@@ -0,0 +1,262 @@
+from array import array
+import datetime
+import itertools
+import mmap
+import os
+import struct
+import sys
+from ..utils import EventsRepoError
+
+MAGIC = b"TDEV"
+VERSION = 1
+
+#Header: magic, version, number of events, size of the string heap
+HEADER = struct.Struct("<4sHxxQQ")
+#Columns, one value per event and in this order, followed by the heap with the UTF-8 names and descriptions
+COLUMNS = (
+    ("startingDates", "i"), #Date ordinals
+    ("endingDates", "i"),
+    ("nameOffsets", "Q"), #Offsets in the heap, the description of an event follows its name
+    ("descriptionOffsets", "Q"),
+    ("endOffsets", "Q"),
+    ("flags", "B")
+)
+DONE_FLAG = 1
+DONE_TABLE = bytes(flags & DONE_FLAG for flags in range(256))
+
+class SnapshotError(EventsRepoError): #Reported like the other errors of the events data files
+    pass
+
+def _to_little_endian(values):
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values
+
+def _read_header(data, filename):
+    '''
+    Function that checks the header of a snapshot
+
+    Args:
+        data (bytes-like): The beginning of the file, at least the header
+        filename (string): Path of the snapshot, used in the error messages
+
+    Raises:
+        SnapshotError: If the file is not a snapshot, or was written by a newer version
+
+    Returns:
+        (tuple): The number of events and the size of the string heap
+    '''
+
+    if len(data) < HEADER.size:
+        raise SnapshotError(f"'{filename}' is not an events snapshot!")
+
+    magic, version, count, heapSize = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version > VERSION:
+        raise SnapshotError(f"'{filename}' is not an events snapshot, or was written by a newer version!")
+
+    return count, heapSize
+
+class EventsSnapshot:
+    def __init__(self, filename):
+        '''
+        Constructor function for a read-only view of a binary events snapshot
+
+        The file is memory mapped, so opening it doesn't read it: an event is decoded only when it is
+        accessed. The layout is a fixed size header, one little-endian column for every field of the
+        events (see COLUMNS), then a heap with the UTF-8 names and descriptions
+
+        Args:
+            filename (string): Path of the snapshot
+
+        Raises:
+            SnapshotError: If the file is not a snapshot, or was written by a newer version
+        '''
+
+        with open(filename, "rb") as file:
+            self.__map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(file.fileno()).st_size else b""
+
+        try:
+            self.__count, heapSize = _read_header(self.__map, filename)
+        except SnapshotError:
+            self.close()
+            raise
+
+        #Start offset of every column, the heap is last
+        self.__offsets = {}
+        offset = HEADER.size
+        for name, typecode in COLUMNS:
+            self.__offsets[name] = offset
+            offset += self.__count * array(typecode).itemsize
+        self.__heapOffset = offset
+
+        if self.__heapOffset + heapSize > len(self.__map):
+            self.close()
+            raise SnapshotError(f"'{filename}' is truncated!")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        if isinstance(self.__map, mmap.mmap):
+            self.__map.close()
+
+    def __len__(self):
+        return self.__count
+
+    def __value(self, column, typecode, index):
+        return struct.unpack_from("<" + typecode, self.__map, self.__offsets[column] + index * array(typecode).itemsize)[0]
+
+    def __getitem__(self, index):
+        '''
+        Function that decodes the event at position 'index'
+
+        Returns:
+            (tuple): The (name, description, startingDate, endingDate, done) of the event
+        '''
+
+        if index < 0:
+            index += self.__count
+        if not 0 <= index < self.__count:
+            raise IndexError("Event index out of range")
+
+        heap = self.__heapOffset
+        nameOffset = heap + self.__value("nameOffsets", "Q", index)
+        descriptionOffset = heap + self.__value("descriptionOffsets", "Q", index)
+        endOffset = heap + self.__value("endOffsets", "Q", index)
+
+        return (
+            self.__map[nameOffset:descriptionOffset].decode("utf-8"),
+            self.__map[descriptionOffset:endOffset].decode("utf-8"),
+            datetime.date.fromordinal(self.__value("startingDates", "i", index)),
+            datetime.date.fromordinal(self.__value("endingDates", "i", index)),
+            bool(self.__value("flags", "B", index) & DONE_FLAG)
+        )
+
+    def __iter__(self):
+        return (self[index] for index in range(self.__count))
+
+    def get_column(self, name):
+        '''
+        Function that reads a whole column with a single copy
+
+        Args:
+            name (string): One of the names of COLUMNS
+
+        Returns:
+            (array): The values of the column, one for every event
+        '''
+
+        typecode = dict(COLUMNS)[name]
+        values = array(typecode)
+        values.frombytes(self.__map[self.__offsets[name]:self.__offsets[name] + self.__count * values.itemsize])
+
+        return _to_little_endian(values)
+
+    def get_heap(self):
+        '''
+        Function that returns a copy of the string heap, the offsets of the columns are relative to it
+        '''
+
+        return bytearray(self.__map[self.__heapOffset:])
+
+def read_snapshot_columns(filename, skipBefore):
+    '''
+    Generator function that reads a snapshot as columns, in the layout used by 'EventStore.extend_encoded'.
+    The file is memory mapped and the columns are views of the map, so nothing is copied or decoded until
+    the caller copies them. They are valid only until the generator continues: it yields once, then
+    releases the views and closes the map
+
+    Args:
+        filename (string): Path of the snapshot
+        skipBefore (datetime.date): Done events that ended before this date are dropped
+
+    Raises:
+        SnapshotError: If the file is not a snapshot, or is truncated
+
+    Yields:
+        (tuple): (text, nameOffsets, descriptionOffsets, endOffsets, startingOrdinals, endingOrdinals, dones)
+    '''
+
+    with open(filename, "rb") as file:
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(file.fileno()).st_size else b""
+
+    views = [memoryview(data)] #Every view of the map is released before it's closed
+    try:
+        count, heapSize = _read_header(data, filename)
+        if HEADER.size + count * sum(array(typecode).itemsize for _, typecode in COLUMNS) + heapSize > len(data):
+            raise SnapshotError(f"'{filename}' is truncated!")
+
+        columns = {}
+        offset = HEADER.size
+        for name, typecode in COLUMNS:
+            end = offset + count * array(typecode).itemsize
+            views.append(views[0][offset:end])
+            views.append(views[-1].cast(typecode))
+            #The columns are little-endian, a big-endian machine needs a swapped copy
+            columns[name] = views[-1] if sys.byteorder == "little" else _to_little_endian(array(typecode, views[-1]))
+            offset = end
+
+        views.append(views[0][offset:offset + heapSize])
+        text = views[-1]
+
+        names = ("nameOffsets", "descriptionOffsets", "endOffsets", "startingDates", "endingDates")
+        values = [columns[name] for name in names]
+        dones = columns["flags"].tobytes().translate(DONE_TABLE) #1 for the done events, 0 for the other ones
+
+        #Only the done events can be expired, so the other ones are never looked at
+        endingOrdinals = columns["endingDates"]
+        skipBefore = skipBefore.toordinal()
+        expired = [index for index in itertools.compress(range(len(dones)), dones) if skipBefore > endingOrdinals[index]]
+
+        if expired:
+            keep = bytearray(b"\x01") * len(dones)
+            for index in expired:
+                keep[index] = 0
+
+            values = [array(dict(COLUMNS)[name], itertools.compress(column, keep)) for name, column in zip(names, values)]
+            dones = bytes(itertools.compress(dones, keep))
+
+        yield (text, *values, dones)
+    finally:
+        for view in reversed(views):
+            view.release()
+        if isinstance(data, mmap.mmap):
+            data.close()
+
+def write_snapshot(filename, events):
+    '''
+    Function that writes the events to a binary snapshot. The snapshot is written to a temporary
+    file first, which then replaces 'filename'
+
+    Args:
+        filename (string): Path of the snapshot
+        events (iterable): Objects with the functions of 'Event'
+    '''
+
+    columns = {name: array(typecode) for name, typecode in COLUMNS}
+    heap = bytearray()
+
+    for event in events:
+        columns["startingDates"].append(event.get_startingDate().toordinal())
+        columns["endingDates"].append(event.get_endingDate().toordinal())
+        columns["nameOffsets"].append(len(heap))
+        heap += event.get_name().encode("utf-8")
+        columns["descriptionOffsets"].append(len(heap))
+        heap += event.get_description().encode("utf-8")
+        columns["endOffsets"].append(len(heap))
+        columns["flags"].append(DONE_FLAG if event.is_done() else 0)
+
+    temporaryFilename = filename + ".tmp"
+    with open(temporaryFilename, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, len(columns["flags"]), len(heap)))
+        for name, _ in COLUMNS:
+            file.write(_to_little_endian(columns[name]).tobytes())
+        file.write(heap)
+        file.flush()
+        os.fsync(file.fileno())
+
+    os.replace(temporaryFilename, filename)
@@ -0,0 +1,125 @@
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError: #Windows
+    fcntl = None
+    import msvcrt
+
+class FileLock:
+    GENERATION_OFFSET = 8 #Windows locks are mandatory, so the counter is kept after the locked byte
+
+    def __init__(self, filename):
+        '''
+        Constructor function for the lock, an advisory lock on the file 'filename' that is shared by
+        every process using the same data file. The lock file also keeps a generation counter, that
+        every process increases after it changes the data files
+
+        The lock is also shared by the threads of a process, and it's reentrant for the thread that holds
+        it: only its outermost 'acquire' waits for the other threads and processes, and only its last
+        'release' lets them continue
+
+        Args:
+            filename (string): Path of the lock file, created if it doesn't exist
+        '''
+
+        #Opened unbuffered, so the counter is always read from the file (and closed with the object)
+        self.__file = os.fdopen(os.open(filename, os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644), "r+b", buffering=0)
+        self.__threadLock = threading.Lock() #Held with the file lock, so the other threads of the process wait for it too
+        self.__fileLock = threading.Lock() #The position of the file is shared, so it's only moved by one thread at a time
+        self.__owner = None #The id of the thread that holds the lock
+        self.__depth = 0 #Number of 'acquire' calls of the owner, not released yet
+
+    def acquire(self):
+        '''
+        Function that waits until no other thread or process holds the lock, then takes it
+        '''
+
+        if self.__owner == threading.get_ident():
+            self.__depth += 1
+            return
+
+        self.__threadLock.acquire()
+        try:
+            if fcntl is not None:
+                fcntl.flock(self.__file.fileno(), fcntl.LOCK_EX)
+            else:
+                while True:
+                    try:
+                        with self.__fileLock:
+                            self.__file.seek(0)
+                            msvcrt.locking(self.__file.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        pass #LK_LOCK gives up after 10 seconds, the lock is waited for as long as needed
+        except BaseException:
+            self.__threadLock.release()
+            raise
+
+        self.__owner = threading.get_ident()
+        self.__depth = 1
+
+    def release(self):
+        '''
+        Function that releases the lock, the other threads and processes can take it after the last 'release'
+
+        Raises:
+            RuntimeError: If the lock is not held by this thread
+        '''
+
+        if self.__owner != threading.get_ident():
+            raise RuntimeError("The lock is not held by this thread!")
+
+        self.__depth -= 1
+        if self.__depth > 0:
+            return
+
+        self.__owner = None
+        try:
+            if fcntl is not None:
+                fcntl.flock(self.__file.fileno(), fcntl.LOCK_UN)
+            else:
+                with self.__fileLock:
+                    self.__file.seek(0)
+                    msvcrt.locking(self.__file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self.__threadLock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exception):
+        self.release()
+
+    def get_generation(self):
+        '''
+        Function that returns the generation counter, it can be read without holding the lock
+        '''
+
+        with self.__fileLock:
+            self.__file.seek(self.GENERATION_OFFSET)
+            data = self.__file.read(8)
+
+        return int.from_bytes(data, "little") if len(data) == 8 else 0
+
+    def increase_generation(self):
+        '''
+        Function that increases the generation counter, called (while holding the lock) after every
+        change of the data files
+
+        Returns:
+            (int): The new generation
+        '''
+
+        generation = self.get_generation() + 1
+
+        with self.__fileLock:
+            self.__file.seek(self.GENERATION_OFFSET)
+            self.__file.write(generation.to_bytes(8, "little"))
+
+        return generation
+
+    def close(self):
+        self.__file.close()
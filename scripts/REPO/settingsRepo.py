@@ -1,32 +1,176 @@
-import toml
+import copy
 import os
+from ..DOMAIN.layout import Layout
+from ..renderer.encoder import Encoder
+
+try:
+    import tomllib #Python 3.11+, faster than the toml package
+except ImportError:
+    tomllib = None
+    import toml
+
 class Settings():
-    def __init__(self, filename):
+    def __init__(self, filename, errorCallback = None):
+        '''
+        Constructor function for the settings, loaded from a .toml file. Changes of the file are loaded
+        again by 'refresh', all at once: the layout of the columns is a new (immutable) object
+
+        Args:
+            filename (string): Path of the settings file
+            errorCallback (callable): Optional function called with the exception when a changed file is not valid (the current settings are kept), or a listener fails
+
+        Raises:
+            ValueError: If the settings file is not valid
+        '''
+
         self.MARGIN_SIZE_X = 0.01 #This represents % of width
         self.MARGIN_SIZE_Y = 0.05 #This represents % of height
         self.COLUMNS = ["TODAY", "THIS WEEK", "NOT SO SOON"]
+        self.BUCKET_DAYS = [1, 7] #Remaining days limit of every column, except the last one
         self.HEADER_COLOR = (255, 255, 255)
         self.TEXT_COLOR = [(173, 0, 0), (255, 230, 0), (34, 255, 0)] #Each color coresponds to the column, same order
         self.SHADOW_COLOR = (0, 0, 0)
         self.FONT = "arial.ttf"
         self.FONT_SIZE = 0.02 #This represent % of height
         self.LINE_SPACING = 20
-        
+        self.MIN_FONT_SIZE = 0.012 #The font is shrunk down to this size (% of height) when the events don't fit
+        self.WRAP_LINES = 2 #The most lines an event is wrapped to
+        self.MAX_SUB_COLUMNS = 2 #The most sub-columns a column is split into when the events don't fit with the smallest font
+        self.STORAGE_BACKEND = "text" #"text" for the events file, "binary" for the events snapshot, "sqlite" for the database
+        self.EVENTS_FILE = os.path.join("data", "events.txt")
+        self.EVENTS_SNAPSHOT = os.path.join("data", "events.bin")
+        self.EVENTS_DATABASE = os.path.join("data", "events.db")
+        self.RENDER_CACHE_DIRECTORY = os.path.join("temp", "renders")
+        self.RENDER_CACHE_ENTRIES = 16
+        self.RENDER_CACHE_BYTES = 256 * 1024 * 1024
+        self.IMAGE_CACHE_BYTES = 512 * 1024 * 1024
+        self.WALLPAPERS_DIRECTORY = "wallpapers"
+        self.WALLPAPERS_INDEX = os.path.join("data", "wallpapers_index.json")
+        self.WALLPAPERS_EXTENSIONS = [".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp"]
+        self.WALLPAPERS_RECURSIVE = False
+        self.WALLPAPERS_SCAN_WORKERS = 8
+        self.WALLPAPERS_PROBE_ON_SCAN = False
+        self.DISPLAY_SIZE = None #The (width, height) the wallpapers are decoded at, None keeps their original size
+        self.BATCH_DIRECTORY = os.path.join("temp", "batch")
+        self.BATCH_WORKERS = None #None uses one worker process per core
+        self.OUTPUT_PRESET = "" #A preset of the encoder ("fast", "balanced", "quality", "small", "lossless"), empty to use the values below
+        self.OUTPUT_FORMAT = "source" #"source" keeps the format of the wallpaper, or "jpeg", "png", "bmp", "webp"
+        self.OUTPUT_QUALITY = 90
+        self.OUTPUT_SUBSAMPLING = "4:2:0"
+        self.OUTPUT_OPTIMIZE = False
+        self.OUTPUT_PROGRESSIVE = False
+        self.OUTPUT_COMPRESS_LEVEL = 6
+        self.WRITE_BEHIND = True #Changes of the events are written once they stop for CHANGES_DELAY seconds, instead of one by one (not used by the SQLite backend)
+        self.CHANGES_DELAY = 1.0 #Quiet period (seconds) after which the changes of the events are written and the wallpaper is rendered again
+        self.PROFILING_ENABLED = False
+        self.PROFILING_SINK = "memory" #"memory", "jsonl" or "prometheus"
+        self.PROFILING_PATH = os.path.join("temp", "profile.jsonl")
+        self.PROFILING_BUFFER_SIZE = 1000
+        self.SETTINGS_RELOAD_SECONDS = 2.0 #How often the settings file is checked for changes, 0 to never load it again
+        self.LAYOUT = None #The validated layout of the columns (Layout object), built from the values above
+
         self.__filename = filename
+        self.__errorCallback = errorCallback
+        self.__listeners = [] #Functions called after the settings changed
+        self.__signature = self.__read_signature()
         self.__load_settings()
 
+    def __getstate__(self):
+        #The settings are sent to the batch worker processes, without the functions of this process
+        state = self.__dict__.copy()
+        state["_Settings__errorCallback"] = None
+        state["_Settings__listeners"] = []
+
+        return state
+
+    def __read_signature(self):
+        stat = os.stat(self.__filename)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def __read_config(self):
+        '''
+        Function that parses the .toml file
+        '''
+
+        if tomllib is not None:
+            with open(self.__filename, "rb") as file:
+                return tomllib.load(file)
+
+        with open(self.__filename, "r") as file:
+            return toml.load(file)
+
+    def subscribe(self, listener):
+        '''
+        Function that registers a function that is called (without arguments) after the settings changed
+
+        Args:
+            listener (callable): The function that will be called, for example one that drops what was computed from the old settings
+        '''
+
+        self.__listeners.append(listener)
+
+    def refresh(self):
+        '''
+        Function that loads the settings again if the modification time or the size of the file changed
+        since it was read. The new values replace the current ones all at once, and only if the whole
+        file is valid
+
+        Only the layout ([margins], [columns], [colors], [font]), the [display] size and the [output]
+        settings are used again after a change, the other sections are read once, when the program starts.
+        An invalid file, and a listener that fails, are reported through the error callback
+
+        Returns:
+            (bool): True if the settings changed
+        '''
+
+        try:
+            signature = self.__read_signature()
+        except OSError:
+            return False #The file is being replaced
+
+        if signature == self.__signature:
+            return False
+        self.__signature = signature
+
+        settings = copy.copy(self)
+        try:
+            settings.__load_settings()
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            if self.__errorCallback is not None:
+                self.__errorCallback(e)
+            return False
+
+        values = {name: value for name, value in vars(settings).items() if name.isupper()}
+        if all(getattr(self, name) == value for name, value in values.items()):
+            return False #Only the comments or the formatting changed
+
+        self.__dict__.update(values)
+
+        #A failing listener doesn't stop the other ones, the new settings are already used
+        for listener in self.__listeners:
+            try:
+                listener()
+            except Exception as e:
+                if self.__errorCallback is not None:
+                    self.__errorCallback(e)
+
+        return True
+
     def __load_settings(self):
         '''
         Function that loads the settings from the .toml file
+
+        Raises:
+            ValueError: If the layout or the [output] values are not valid
         '''
 
-        with open(self.__filename, "r") as file:
-            config = toml.load(file)
+        config = self.__read_config()
 
         self.MARGIN_SIZE_X = config["margins"]["x"]
-        self.MARGIN_SIZE_X = config["margins"]["y"]
+        self.MARGIN_SIZE_Y = config["margins"]["y"]
 
         self.COLUMNS = config["columns"]["names"]
+        self.BUCKET_DAYS = config["columns"]["days"]
 
         self.HEADER_COLOR = tuple(config["colors"]["header"])
         self.TEXT_COLOR = [tuple(color) for color in config["colors"]["text"]]
@@ -34,4 +178,74 @@ class Settings():
 
         self.FONT = config["font"]["name"]
         self.FONT_SIZE = config["font"]["size"]
-        self.LINE_SPACING = config["font"]["line_spacing"]
\ No newline at end of file
+        self.LINE_SPACING = config["font"]["line_spacing"]
+        self.MIN_FONT_SIZE = config["font"]["min_size"]
+        self.WRAP_LINES = config["font"]["wrap_lines"]
+        self.MAX_SUB_COLUMNS = config["columns"]["max_sub_columns"]
+
+        self.STORAGE_BACKEND = config["storage"]["backend"]
+        self.EVENTS_FILE = config["storage"]["events_file"]
+        self.EVENTS_SNAPSHOT = config["storage"]["events_snapshot"]
+        self.EVENTS_DATABASE = config["storage"]["events_database"]
+
+        self.RENDER_CACHE_DIRECTORY = config["cache"]["render_directory"]
+        self.RENDER_CACHE_ENTRIES = config["cache"]["render_entries"]
+        self.RENDER_CACHE_BYTES = int(config["cache"]["render_megabytes"] * 1024 * 1024)
+        self.IMAGE_CACHE_BYTES = int(config["cache"]["image_megabytes"] * 1024 * 1024)
+
+        self.WALLPAPERS_DIRECTORY = config["wallpapers"]["directory"]
+        self.WALLPAPERS_INDEX = config["wallpapers"]["index"]
+        self.WALLPAPERS_EXTENSIONS = config["wallpapers"]["extensions"]
+        self.WALLPAPERS_RECURSIVE = config["wallpapers"]["recursive"]
+        self.WALLPAPERS_SCAN_WORKERS = config["wallpapers"]["scan_workers"]
+        self.WALLPAPERS_PROBE_ON_SCAN = config["wallpapers"]["probe_on_scan"]
+
+        displayWidth, displayHeight = config["display"]["width"], config["display"]["height"]
+        self.DISPLAY_SIZE = (displayWidth, displayHeight) if displayWidth and displayHeight else None
+
+        self.BATCH_DIRECTORY = config["batch"]["directory"]
+        self.BATCH_WORKERS = config["batch"]["workers"] or None
+
+        self.OUTPUT_PRESET = config["output"]["preset"]
+        self.OUTPUT_FORMAT = config["output"]["format"]
+        self.OUTPUT_QUALITY = config["output"]["quality"]
+        self.OUTPUT_SUBSAMPLING = config["output"]["subsampling"]
+        self.OUTPUT_OPTIMIZE = config["output"]["optimize"]
+        self.OUTPUT_PROGRESSIVE = config["output"]["progressive"]
+        self.OUTPUT_COMPRESS_LEVEL = config["output"]["png_compress_level"]
+
+        self.WRITE_BEHIND = config["changes"]["write_behind"]
+        self.CHANGES_DELAY = config["changes"]["delay_seconds"]
+
+        self.PROFILING_ENABLED = config["profiling"]["enabled"]
+        self.PROFILING_SINK = config["profiling"]["sink"]
+        self.PROFILING_PATH = config["profiling"]["path"]
+        self.PROFILING_BUFFER_SIZE = config["profiling"]["buffer_size"]
+
+        self.SETTINGS_RELOAD_SECONDS = config["settings"]["reload_seconds"]
+
+        self.LAYOUT = Layout(
+            self.MARGIN_SIZE_X, self.MARGIN_SIZE_Y, self.COLUMNS, self.BUCKET_DAYS,
+            self.HEADER_COLOR, self.TEXT_COLOR, self.SHADOW_COLOR,
+            self.FONT, self.FONT_SIZE, self.LINE_SPACING,
+            self.MIN_FONT_SIZE, self.WRAP_LINES, self.MAX_SUB_COLUMNS
+        )
+
+        Encoder.from_settings(self) #Only checks the [output] values, the encoder is created by its users
+
+    def get_render_values(self):
+        '''
+        Function that returns the settings that change the look of a rendered wallpaper
+        '''
+
+        return self.LAYOUT.get_values() + (self.DISPLAY_SIZE,)
+
+    def get_output_values(self):
+        '''
+        Function that returns the settings that change the encoding of a rendered wallpaper
+        '''
+
+        return (
+            self.OUTPUT_PRESET, self.OUTPUT_FORMAT, self.OUTPUT_QUALITY, self.OUTPUT_SUBSAMPLING,
+            self.OUTPUT_OPTIMIZE, self.OUTPUT_PROGRESSIVE, self.OUTPUT_COMPRESS_LEVEL
+        )
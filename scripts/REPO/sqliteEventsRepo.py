@@ -0,0 +1,214 @@
+import datetime
+import sqlite3
+from ..DOMAIN.event import Event
+from ..utils import EventsRepoError
+
+class SqliteEventsRepo:
+    def __init__(self, filename):
+        '''
+        Constructor function for the SQLite backed repo object, that exposes the same
+        functions as 'EventsRepo'
+
+        Every change is committed right away, there is no write-behind: an uncommitted change would
+        keep the database locked for the other processes until it's committed
+
+        Args:
+            filename (string): Path of the SQLite database that will be used to store the data
+        '''
+
+        #The repo can be used from the render and flush threads, the callers never use it from two threads at once
+        self.__connection = sqlite3.connect(filename, check_same_thread=False)
+        self.__ids = None #The ids of the rows, in the order of 'get_events', read again after events are added
+
+        self.__create_schema()
+        self.__remove_expired_events()
+
+    def __create_schema(self):
+        '''
+        Function that creates the events table and its indexes, if they don't exist yet
+
+        Dates are stored as iso-format strings, so they can be compared as text
+        '''
+
+        with self.__connection:
+            self.__connection.execute(
+                "CREATE TABLE IF NOT EXISTS events ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "name TEXT NOT NULL, "
+                "description TEXT NOT NULL, "
+                "startingDate TEXT NOT NULL, "
+                "endingDate TEXT NOT NULL, "
+                "done INTEGER NOT NULL DEFAULT 0)"
+            )
+            self.__connection.execute("CREATE INDEX IF NOT EXISTS events_endingDate ON events (endingDate)")
+            self.__connection.execute("CREATE INDEX IF NOT EXISTS events_done ON events (done)")
+
+    def __remove_expired_events(self):
+        '''
+        Function that removes the events that are done and already ended, the same
+        way 'EventsRepo' skips them when loading its data file
+        '''
+
+        with self.__connection:
+            self.__connection.execute(
+                "DELETE FROM events WHERE done = 1 AND endingDate < ?",
+                (datetime.date.today().isoformat(),)
+            )
+
+    def flush(self):
+        '''
+        Function that commits the changes that are not committed yet (every change is already
+        committed, it's kept so the repo is used like 'EventsRepo')
+        '''
+
+        self.__connection.commit()
+
+    @staticmethod
+    def __row_to_event(row):
+        '''
+        Function that creates an object of type 'Event' from a row of the events table
+        '''
+
+        name, description, startingDate, endingDate, done = row
+
+        event = Event(name, description, datetime.date.fromisoformat(startingDate), datetime.date.fromisoformat(endingDate))
+        if done: event.set_as_done()
+
+        return event
+
+    @staticmethod
+    def __event_to_row(event):
+        return (
+            event.get_name(),
+            event.get_description(),
+            event.get_startingDate().isoformat(),
+            event.get_endingDate().isoformat(),
+            1 if event.is_done() else 0
+        )
+
+    def __get_id(self, index):
+        '''
+        Function that returns the id of the row at position 'index' (the same position the
+        event has in the list returned last by 'get_events')
+
+        Raises:
+            IndexError: If there is no event with the index 'index'
+        '''
+
+        if self.__ids is None:
+            self.__ids = [row[0] for row in self.__connection.execute("SELECT id FROM events ORDER BY id")]
+
+        if not 0 <= index < len(self.__ids):
+            raise IndexError("Event index out of range")
+
+        return self.__ids[index]
+
+    def get_events(self):
+        '''
+        Function that returns the list of events
+
+        Raises:
+            EventsRepoError: if there are no stored existing events yet
+
+        Returns:
+            A list of all of the current stored objects of type 'Event'
+        '''
+
+        rows = self.__connection.execute(
+            "SELECT id, name, description, startingDate, endingDate, done FROM events ORDER BY id"
+        ).fetchall()
+        self.__ids = [row[0] for row in rows]
+
+        if not rows:
+            raise EventsRepoError("No existing events yet!")
+
+        return [self.__row_to_event(row[1:]) for row in rows]
+
+    def get_events_by_deadline(self, boundaries):
+        '''
+        Function that splits the events by their ending date, using one indexed range
+        query for every group
+
+        Args:
+            boundaries (list of datetime.date): Sorted dates, the group 'i' contains the events that end after boundaries[i-1] and until boundaries[i]
+
+        Returns:
+            (list of lists): len(boundaries) + 1 lists of events, each one in the order of 'get_events'
+        '''
+
+        groups = []
+        limits = [None] + list(boundaries) + [None]
+
+        for after, until in zip(limits, limits[1:]):
+            query = "SELECT name, description, startingDate, endingDate, done FROM events WHERE 1"
+            parameters = []
+
+            if after is not None:
+                query += " AND endingDate > ?"
+                parameters.append(after.isoformat())
+            if until is not None:
+                query += " AND endingDate <= ?"
+                parameters.append(until.isoformat())
+
+            rows = self.__connection.execute(query + " ORDER BY id", parameters).fetchall()
+            groups.append([self.__row_to_event(row) for row in rows])
+
+        return groups
+
+    def delete_event(self, index):
+        '''
+        Function that deletes the event with the index 'index'
+
+        Args:
+            index (int): The index of the element that will be deleted
+        '''
+
+        with self.__connection:
+            self.__connection.execute("DELETE FROM events WHERE id = ?", (self.__get_id(index),))
+
+        del self.__ids[index]
+
+    def mark_as_done(self, index):
+        '''
+        Function that sets the event at position 'index' as done
+        '''
+
+        with self.__connection:
+            self.__connection.execute("UPDATE events SET done = 1 WHERE id = ?", (self.__get_id(index),))
+
+    def add_event(self, event):
+        '''
+        Function that adds the event 'event' to the database
+
+        Args:
+            event (event object): The event that needs to be added
+        '''
+
+        self.add_events([event])
+
+    def add_events(self, events):
+        '''
+        Function that adds all the events from 'events' to the database, in a single transaction
+
+        Args:
+            events (iterable of event objects): The events that need to be added
+        '''
+
+        with self.__connection:
+            self.__connection.executemany(
+                "INSERT INTO events (name, description, startingDate, endingDate, done) VALUES (?, ?, ?, ?, ?)",
+                (self.__event_to_row(event) for event in events)
+            )
+
+        self.__ids = None
+
+    def count(self):
+        '''
+        Function that returns the number of stored events
+        '''
+
+        return self.__connection.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+    def close(self):
+        self.flush()
+        self.__connection.close()
@@ -0,0 +1,130 @@
+import json
+import os
+from PIL import Image
+
+class WallpaperIndex:
+    VERSION = 1
+
+    def __init__(self, filename):
+        '''
+        Constructor function for the wallpaper metadata index, that keeps the size and format of
+        every known image file, so the images don't need to be opened again on every start
+
+        Args:
+            filename (string): Path of the file that will be used to store the index
+        '''
+
+        self.__filename = filename
+        self.__entries = {} #path -> {"mtime", "size", "width", "height", "format"}
+        self.__dirty = False
+
+        self.__load_from_file()
+
+    def __load_from_file(self):
+        '''
+        Function that loads the stored index, an unreadable or outdated index is ignored
+        '''
+
+        try:
+            with open(self.__filename, "r") as file:
+                content = json.load(file)
+        except (OSError, ValueError):
+            return
+
+        if isinstance(content, dict) and content.get("version") == self.VERSION:
+            self.__entries = content["entries"]
+
+    def save(self):
+        '''
+        Function that writes the index to its file, if it changed since it was loaded
+        '''
+
+        if not self.__dirty:
+            return
+
+        temporaryFilename = self.__filename + ".tmp"
+        with open(temporaryFilename, "w") as file:
+            json.dump({"version": self.VERSION, "entries": self.__entries}, file)
+
+        os.replace(temporaryFilename, self.__filename)
+        self.__dirty = False
+
+    def lookup(self, path, stat):
+        '''
+        Function that returns the stored metadata of an image, if the image didn't change since
+        it was indexed. A stale entry is removed
+
+        Args:
+            path (string): The path of the image
+            stat (os.stat_result): The current stat of the image
+
+        Returns:
+            (dict): The metadata of the image, or None if it isn't indexed
+        '''
+
+        entry = self.__entries.get(path)
+        if entry is None:
+            return None
+
+        if entry["mtime"] != stat.st_mtime_ns or entry["size"] != stat.st_size:
+            del self.__entries[path]
+            self.__dirty = True
+            return None
+
+        return entry
+
+    @staticmethod
+    def read_metadata(path):
+        '''
+        Function that reads the size and format of an image from its header (the pixels are
+        not decoded)
+
+        Args:
+            path (string): The path of the image
+
+        Returns:
+            (dict): The metadata of the image
+        '''
+
+        stat = os.stat(path)
+        with Image.open(path) as image:
+            width, height = image.size
+            imageFormat = image.format
+
+        return {"mtime": stat.st_mtime_ns, "size": stat.st_size, "width": width, "height": height, "format": imageFormat}
+
+    def store(self, path, entry):
+        '''
+        Function that stores the metadata of an image, read by 'read_metadata'
+        '''
+
+        self.__entries[path] = entry
+        self.__dirty = True
+
+    def probe(self, path):
+        '''
+        Function that reads the metadata of an image from its header, then stores it in the index
+
+        Args:
+            path (string): The path of the image
+
+        Returns:
+            (dict): The metadata of the image
+        '''
+
+        entry = self.read_metadata(path)
+        self.store(path, entry)
+
+        return entry
+
+    def retain(self, paths):
+        '''
+        Function that removes the entries of the images that no longer exist
+
+        Args:
+            paths (set of strings): The paths of the existing images
+        '''
+
+        for path in [path for path in self.__entries if path not in paths]:
+            del self.__entries[path]
+            self.__dirty = True
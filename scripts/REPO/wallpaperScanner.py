@@ -0,0 +1,84 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import os
+from .wallpaperIndex import WallpaperIndex
+
+class WallpaperScanner:
+    DEFAULT_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp")
+
+    def __init__(self, extensions = DEFAULT_EXTENSIONS, recursive = False, maxWorkers = 8):
+        '''
+        Constructor function for the wallpaper scanner, that lists the images of a directory
+        and reads their headers concurrently
+
+        Args:
+            extensions (iterable of strings): The accepted file extensions (case insensitive)
+            recursive (bool): If the subdirectories are scanned too
+            maxWorkers (int): Maximum number of threads that read image headers
+        '''
+
+        self.__extensions = {extension.lower() for extension in extensions}
+        self.__recursive = recursive
+        self.__maxWorkers = maxWorkers
+
+    def list_images(self, directory):
+        '''
+        Function that lists the images of 'directory' in a single 'os.scandir' pass per directory. A
+        directory reached again (through a symbolic link) is scanned only once
+
+        Args:
+            directory (string): The path of the scanned directory
+
+        Returns:
+            (list of tuples): Sorted (path, os.stat_result) pairs of the found images
+        '''
+
+        images = []
+        directories = [directory]
+        visited = set() #The (device, inode) of the scanned directories, a link to a parent directory would loop forever otherwise
+
+        while directories:
+            path = directories.pop()
+            stat = os.stat(path)
+            if (stat.st_dev, stat.st_ino) in visited:
+                continue
+            visited.add((stat.st_dev, stat.st_ino))
+
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        if self.__recursive: directories.append(entry.path)
+                    elif os.path.splitext(entry.name)[1].lower() in self.__extensions:
+                        images.append((entry.path, entry.stat()))
+
+        images.sort()
+        return images
+
+    def read_all_metadata(self, paths, progress = None):
+        '''
+        Function that reads the headers of the images from 'paths' on a bounded thread pool
+
+        Args:
+            paths (list of strings): The paths of the images
+            progress (function): Optional function called as progress(done, total) after every image
+
+        Returns:
+            (dict): path -> metadata (see 'WallpaperIndex.read_metadata'), unreadable images are left out
+        '''
+
+        metadata = {}
+        if not paths:
+            return metadata
+
+        with ThreadPoolExecutor(max_workers=self.__maxWorkers) as executor:
+            futures = {executor.submit(WallpaperIndex.read_metadata, path): path for path in paths}
+
+            for done, future in enumerate(as_completed(futures), 1):
+                try:
+                    metadata[futures[future]] = future.result()
+                except OSError:
+                    pass #Not an image, or a damaged one
+
+                if progress is not None:
+                    progress(done, len(paths))
+
+        return metadata
@@ -1,32 +1,84 @@
 from ..utils import WallpaperRepoError
 from ..DOMAIN.wallpaper import Wallpaper
-import glob
-import os
+from .wallpaperScanner import WallpaperScanner
 from PIL import Image
 
 class WallpapersRepo:
-    def __init__(self):
+    def __init__(self, directory = "wallpapers", index = None, scanner = None, probeOnScan = False, progress = None):
+        '''
+        Constructor function for wallpapers repo object
+
+        Args:
+            directory (string): Path of the directory that contains the wallpapers
+            index (WallpaperIndex object): Optional persistent index of the wallpapers metadata
+            scanner (WallpaperScanner object): Object that lists the images and reads their headers
+            probeOnScan (bool): If the headers of the images missing from the index are read during the scan
+            progress (function): Optional function called as progress(done, total) while headers are read
+        '''
+
         self.__wallpapers = []
+        self.__directory = directory
+        self.__index = index
+        self.__scanner = scanner if scanner is not None else WallpaperScanner()
+        self.__probeOnScan = probeOnScan
+        self.__progress = progress
         
         self.__load_existing_wallpapers()
     
     def __load_existing_wallpapers(self):
         '''
-        Function that searches for all the wallpapers existing in the 'wallpapers' directory,
+        Function that searches for all the wallpapers existing in the wallpapers directory,
         then creates object corresponding with each wallpaper
+
+        The size of a wallpaper comes from the index if the file didn't change since it was indexed.
+        Otherwise it is read during the scan (if 'probeOnScan' is set), or the first time it is needed
+        '''
+
+        existingWallpapers = self.__scanner.list_images(self.__directory)
+
+        entries = {}
+        if self.__index is not None:
+            for path, stat in existingWallpapers:
+                entry = self.__index.lookup(path, stat)
+                if entry is not None: entries[path] = entry
+
+            #On a cold index, the missing headers are read concurrently instead of one by one later
+            if self.__probeOnScan:
+                missing = [path for path, _ in existingWallpapers if path not in entries]
+                for path, entry in self.__scanner.read_all_metadata(missing, self.__progress).items():
+                    self.__index.store(path, entry)
+                    entries[path] = entry
+
+        for path, _ in existingWallpapers:
+            entry = entries.get(path)
+
+            if entry is not None:
+                newWallpaper = Wallpaper(path, entry["width"], entry["height"])
+            else:
+                newWallpaper = Wallpaper(path, sizeLoader=self.__read_size)
+
+            self.__wallpapers.append(newWallpaper)
+
+        if self.__index is not None:
+            self.__index.retain({path for path, _ in existingWallpapers})
+            self.__index.save()
+
+    def __read_size(self, path):
         '''
+        Function that reads the size of the image from 'path' from its header
+
+        Returns:
+            (tuple of ints): The (width, height) of the image
+        '''
+
+        if self.__index is None:
+            with Image.open(path) as image:
+                return image.size
 
-        existingWallpapers = sorted(
-            glob.glob(os.path.join("wallpapers", '*.[jJ][pP][gG]')) + 
-            glob.glob(os.path.join("wallpapers", '*.[pP][nN][gG]')) + 
-            glob.glob(os.path.join("wallpapers", '*.[gG][iI][fF]'))
-        )
+        entry = self.__index.probe(path)
+        self.__index.save()
 
-        for el in existingWallpapers:
-            with Image.open(el) as image:
-                width, height = image.size
-                newWallpaper = Wallpaper(el, width, height)
-                self.__wallpapers.append(newWallpaper)
+        return entry["width"], entry["height"]
 
     def get__wallpapers(self):
         '''
@@ -42,4 +94,4 @@ class WallpapersRepo:
         if not self.__wallpapers:
             raise WallpaperRepoError("No existing wallpapers yet!")
 
-        return self.__wallpapers
\ No newline at end of file
+        return self.__wallpapers
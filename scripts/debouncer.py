@@ -0,0 +1,59 @@
+import threading
+
+class Debouncer:
+    def __init__(self, delay, function):
+        '''
+        Constructor function for the debouncer, that calls 'function' once, 'delay' seconds after the
+        last of a burst of triggers
+
+        Args:
+            delay (float): The quiet period, in seconds
+            function (callable): The function that is called, without arguments, on a timer thread
+        '''
+
+        self.__delay = delay
+        self.__function = function
+        self.__lock = threading.Lock()
+        self.__timer = None
+        self.__generation = 0 #Increased by every trigger, so a timer that was replaced doesn't call the function
+        self.__pending = False
+
+    def trigger(self):
+        '''
+        Function that (re)starts the quiet period, the function is called when it ends
+        '''
+
+        with self.__lock:
+            if self.__timer is not None:
+                self.__timer.cancel()
+
+            self.__generation += 1
+            self.__pending = True
+
+            self.__timer = threading.Timer(self.__delay, self.__fire, (self.__generation,))
+            self.__timer.daemon = True
+            self.__timer.start()
+
+    def is_pending(self):
+        return self.__pending
+
+    def flush(self):
+        '''
+        Function that calls the function right away if a trigger is waiting for the end of its quiet
+        period, for example before the program exits
+        '''
+
+        with self.__lock:
+            if self.__timer is not None:
+                self.__timer.cancel()
+                self.__timer = None
+
+        self.__fire(None)
+
+    def __fire(self, generation):
+        with self.__lock:
+            if not self.__pending or (generation is not None and generation != self.__generation):
+                return
+            self.__pending = False
+
+        self.__function()
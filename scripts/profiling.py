@@ -0,0 +1,208 @@
+from collections import deque
+import contextlib
+import json
+import os
+import threading
+import time
+
+class RingBufferSink:
+    def __init__(self, size = 1000):
+        '''
+        Constructor function for a sink that keeps the last 'size' records in memory, and prints a
+        summary of them when it's flushed
+
+        Args:
+            size (int): Number of records that are kept, the older ones are dropped
+        '''
+
+        self.__records = deque(maxlen=size)
+
+    def record(self, record):
+        self.__records.append(record) #Appending to a deque is thread safe
+
+    def get_records(self):
+        '''
+        Function that returns the kept records, from the oldest to the newest
+
+        Returns:
+            (list of dicts): The records, see 'Profiler'
+        '''
+
+        return list(self.__records)
+
+    def get_summary(self):
+        '''
+        Function that returns a summary of the kept records: the count, total and mean time of every
+        span, and the total of every counter
+        '''
+
+        spans = {} #Span name: [count, total seconds]
+        counters = {} #Counter name: total
+        for record in self.get_records():
+            if record["type"] == "span":
+                span = spans.setdefault(record["name"], [0, 0.0])
+                span[0] += 1
+                span[1] += record["seconds"]
+            else:
+                counters[record["name"]] = counters.get(record["name"], 0) + record["value"]
+
+        lines = [f"{'span':<28} {'count':>7} {'total (ms)':>12} {'mean (ms)':>11}"]
+        for name, (count, seconds) in sorted(spans.items()):
+            lines.append(f"{name:<28} {count:>7} {seconds * 1000:>12.2f} {seconds * 1000 / count:>11.2f}")
+        for name, total in sorted(counters.items()):
+            lines.append(f"{name:<28} {total:>7}")
+
+        return "\n".join(lines)
+
+    def flush(self):
+        if self.__records:
+            print(f"Profile of the last {len(self.__records)} records:\n{self.get_summary()}")
+
+class JsonLinesSink:
+    def __init__(self, filename):
+        '''
+        Constructor function for a sink that appends every record to a file, as one JSON object per line
+
+        Args:
+            filename (string): Path of the file, created (with its directory) when the first record is written
+        '''
+
+        self.__filename = filename
+        self.__file = None
+        self.__lock = threading.Lock()
+
+    def record(self, record):
+        with self.__lock:
+            if self.__file is None:
+                os.makedirs(os.path.dirname(self.__filename) or ".", exist_ok=True)
+                self.__file = open(self.__filename, "a")
+
+            self.__file.write(json.dumps(record) + "\n")
+
+    def flush(self):
+        with self.__lock:
+            if self.__file is not None:
+                self.__file.flush()
+
+class PrometheusSink:
+    PREFIX = "todo_wallpaper"
+
+    def __init__(self, filename):
+        '''
+        Constructor function for a sink that aggregates the records and writes them to a file in the
+        Prometheus text format (for example for the textfile collector of the node exporter): every span
+        becomes a summary (total seconds and count), every counter a total
+
+        Args:
+            filename (string): Path of the file, rewritten on every flush
+        '''
+
+        self.__filename = filename
+        self.__spans = {} #Span name: [count, total seconds]
+        self.__counters = {} #Counter name: total
+        self.__lock = threading.Lock()
+
+    def record(self, record):
+        with self.__lock:
+            if record["type"] == "span":
+                span = self.__spans.setdefault(record["name"], [0, 0.0])
+                span[0] += 1
+                span[1] += record["seconds"]
+            else:
+                self.__counters[record["name"]] = self.__counters.get(record["name"], 0) + record["value"]
+
+    def get_text(self):
+        '''
+        Function that returns the aggregated records in the Prometheus text format
+        '''
+
+        with self.__lock:
+            lines = [f"# TYPE {self.PREFIX}_span_seconds summary"]
+            for name, (count, seconds) in sorted(self.__spans.items()):
+                lines.append(f'{self.PREFIX}_span_seconds_sum{{span="{name}"}} {seconds}')
+                lines.append(f'{self.PREFIX}_span_seconds_count{{span="{name}"}} {count}')
+
+            for name, total in sorted(self.__counters.items()):
+                lines.append(f"# TYPE {self.PREFIX}_{name}_total counter")
+                lines.append(f"{self.PREFIX}_{name}_total {total}")
+
+        return "\n".join(lines) + "\n"
+
+    def flush(self):
+        '''
+        Function that writes the aggregated records to a temporary file that then replaces the output
+        file, so a collector never reads a partial file
+        '''
+
+        os.makedirs(os.path.dirname(self.__filename) or ".", exist_ok=True)
+
+        temporaryFilename = self.__filename + ".tmp"
+        with open(temporaryFilename, "w") as file:
+            file.write(self.get_text())
+        os.replace(temporaryFilename, self.__filename)
+
+class Profiler:
+    enabled = True
+
+    def __init__(self, sink):
+        '''
+        Constructor function for the profiler, that times spans of code and counts quantities, sending
+        every measurement to 'sink' as a record:
+            - {"type": "span", "name": ..., "seconds": ..., "time": ...} when a span ends
+            - {"type": "counter", "name": ..., "value": ..., "time": ...} for every count
+
+        Args:
+            sink (object): Object with 'record(record)' and 'flush()' functions (RingBufferSink, JsonLinesSink, PrometheusSink)
+        '''
+
+        self.__sink = sink
+
+    def get_sink(self):
+        return self.__sink
+
+    @contextlib.contextmanager
+    def span(self, name):
+        '''
+        Function that times the code inside a 'with' block, the span is recorded even if the code raises
+
+        Args:
+            name (string): The name of the span
+        '''
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.__sink.record({"type": "span", "name": name, "seconds": time.perf_counter() - start, "time": time.time()})
+
+    def count(self, name, value = 1):
+        '''
+        Function that adds 'value' to the counter 'name'
+        '''
+
+        self.__sink.record({"type": "counter", "name": name, "value": value, "time": time.time()})
+
+    def flush(self):
+        self.__sink.flush()
+
+class NullProfiler:
+    enabled = False #Lets the callers skip the work that is only needed to measure something
+
+    def __init__(self):
+        '''
+        Constructor function for the profiler used when profiling is disabled: a span is a shared
+        context that does nothing, and counts are ignored
+        '''
+
+        self.__span = contextlib.nullcontext()
+
+    def span(self, name):
+        return self.__span
+
+    def count(self, name, value = 1):
+        pass
+
+    def flush(self):
+        pass
+
+NULL_PROFILER = NullProfiler()
@@ -0,0 +1,119 @@
+from concurrent.futures import Future
+import threading
+
+class RenderWorker:
+    def __init__(self, service):
+        '''
+        Constructor function for the render worker, that creates and sets wallpapers on a
+        background thread, so the caller doesn't wait for the rendering
+
+        At most one render is waiting at any time: a new request replaces (and cancels) the
+        waiting one, so after a burst of requests only the latest one is rendered. The render
+        that is already running is never interrupted
+
+        Args:
+            service (Service object): The service that creates and sets the wallpapers
+        '''
+
+        self.__service = service
+        self.__condition = threading.Condition(threading.RLock())
+        self.__pending = None #The (wallpaper, force, future) of the waiting render
+        self.__thread = None #Started with the first request
+        self.__closed = False
+
+    def submit(self, wallpaper, callback = None, force = True):
+        '''
+        Function that requests the creation of a wallpaper from 'wallpaper', then returns right away
+
+        Args:
+            wallpaper (Wallpaper object): The wallpaper that will be modified and set as wallpaper
+            callback (callable): Optional function called with the future when the render is done, fails or is cancelled
+            force (bool): If False, nothing is done when the same wallpaper is already set
+
+        Raises:
+            RuntimeError: If the worker was closed
+
+        Returns:
+            (Future object): The result of 'Service.create_set_wallpaper', cancelled if a newer request replaced it before it started
+        '''
+
+        future = Future()
+        if callback is not None:
+            future.add_done_callback(callback)
+
+        with self.__condition:
+            if self.__closed:
+                raise RuntimeError("The render worker is closed!")
+
+            if self.__pending is not None:
+                self.__pending[2].cancel() #Replaced before it started
+
+            self.__pending = (wallpaper, force, future)
+
+            if self.__thread is None:
+                self.__thread = threading.Thread(target=self.__run, name="RenderWorker", daemon=True)
+                self.__thread.start()
+
+            self.__condition.notify()
+
+        return future
+
+    def refresh(self, callback = None):
+        '''
+        Function that requests a new render of the wallpaper that was set last (if there is one), for
+        example after the events changed. Nothing is done if the wallpaper wouldn't change
+
+        Returns:
+            (Future object): The result of the render, or None if no wallpaper was set yet
+        '''
+
+        with self.__condition:
+            #A waiting render reads the events when it starts, so it already shows the changes
+            if self.__pending is not None:
+                future = self.__pending[2]
+                if callback is not None:
+                    future.add_done_callback(callback)
+                return future
+
+            wallpaper = self.__service.get_applied_wallpaper()
+            if wallpaper is None:
+                return None
+
+            return self.submit(wallpaper, callback, force=False)
+
+    def close(self, wait = True):
+        '''
+        Function that stops the worker after the waiting render (if any) is done
+
+        Args:
+            wait (bool): If True, waits for the worker to stop
+        '''
+
+        with self.__condition:
+            self.__closed = True
+            self.__condition.notify()
+
+        if wait and self.__thread is not None:
+            self.__thread.join()
+
+    def __run(self):
+        while True:
+            with self.__condition:
+                while self.__pending is None and not self.__closed:
+                    self.__condition.wait()
+
+                if self.__pending is None:
+                    return
+
+                wallpaper, force, future = self.__pending
+                self.__pending = None
+
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            try:
+                result = self.__service.create_set_wallpaper(wallpaper, force)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
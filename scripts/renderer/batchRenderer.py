@@ -0,0 +1,82 @@
+from concurrent.futures import ProcessPoolExecutor
+import os
+from PIL import Image, ImageOps
+from ..DOMAIN.wallpaper import Wallpaper
+from .encoder import Encoder
+from .textRenderer import TextRenderer
+
+_workerRenderer = None #The renderer of a worker process, created once by '_init_worker'
+
+def _init_worker(settings):
+    global _workerRenderer
+    _workerRenderer = TextRenderer(settings, encoder=Encoder.from_settings(settings))
+
+def _render_job(path, targetSize, categorized_events, output_path):
+    '''
+    Function that renders one job inside a worker process: the source image is decoded once,
+    directly at a reduced size when the format supports it, cropped and resized to the target
+    size, then the events are drawn with a layout computed for that size
+
+    Returns:
+        (string): The output path of the new file
+    '''
+
+    with Image.open(path) as img:
+        img.draft(img.mode, targetSize) #Only JPEG supports it, the other formats ignore it
+        img = ImageOps.fit(img, targetSize, Image.Resampling.LANCZOS)
+
+    return _workerRenderer.add_text_to_wallpaper(Wallpaper(path, *targetSize), img, categorized_events, output_path)
+
+class BatchRenderer:
+    def __init__(self, settings, outputDirectory, maxWorkers = None):
+        '''
+        Constructor function for the batch renderer, that renders a wallpaper for several
+        monitors / resolutions at once, on a pool of worker processes
+
+        Args:
+            settings (Settings object): The layout and style settings
+            outputDirectory (string): Path of the directory where the rendered wallpapers are written
+            maxWorkers (int): Maximum number of worker processes (defaulted to the number of cores)
+        '''
+
+        self.__settings = settings
+        self.__outputDirectory = outputDirectory
+        self.__maxWorkers = maxWorkers
+
+    def get_output_path(self, index, wallpaper, targetSize):
+        '''
+        Function that returns the unique output path of a job
+
+        Args:
+            index (int): The index of the job in the batch
+            wallpaper (Wallpaper object): The source wallpaper
+            targetSize (tuple of ints): The (width, height) of the output
+        '''
+
+        name = os.path.splitext(os.path.basename(wallpaper.get_path()))[0]
+        #Created from the current settings, which can be loaded again while the program runs
+        extension = Encoder.from_settings(self.__settings).get_extension(wallpaper.get_path())
+        return os.path.join(self.__outputDirectory, f"{index}_{name}_{targetSize[0]}x{targetSize[1]}{extension}")
+
+    def render(self, jobs, categorized_events):
+        '''
+        Function that renders all the jobs, in parallel
+
+        Args:
+            jobs (list of tuples): (Wallpaper object, (width, height)) pairs
+            categorized_events (list): The categorized events that are drawn over every wallpaper, as plain events (they are sent to
+                every worker, an event view of the repo would send the whole repo with it)
+
+        Returns:
+            (list of strings): The output paths, in the order of the jobs
+        '''
+
+        os.makedirs(self.__outputDirectory, exist_ok=True)
+
+        with ProcessPoolExecutor(max_workers=self.__maxWorkers, initializer=_init_worker, initargs=(self.__settings,)) as executor:
+            futures = [
+                executor.submit(_render_job, wallpaper.get_path(), tuple(targetSize), categorized_events, self.get_output_path(i, wallpaper, targetSize))
+                for i, (wallpaper, targetSize) in enumerate(jobs)
+            ]
+
+            return [future.result() for future in futures]
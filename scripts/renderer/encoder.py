@@ -0,0 +1,224 @@
+from PIL import GifImagePlugin, Image
+import os
+import tempfile
+
+class Encoder:
+    EXTENSIONS = {"JPEG": ".jpg", "PNG": ".png", "BMP": ".bmp", "WEBP": ".webp"}
+    SOURCE = "SOURCE" #Keeps the format of the source wallpaper
+    SUBSAMPLINGS = ("4:4:4", "4:2:2", "4:2:0")
+
+    #Named settings, every value that is not given keeps the default of the constructor
+    PRESETS = {
+        #Uncompressed: nothing to compress while saving and nothing to decode when the OS loads it, but the biggest files
+        "fast": {"imageFormat": "BMP"},
+        "balanced": {"imageFormat": "JPEG", "quality": 90, "subsampling": "4:2:0"},
+        "quality": {"imageFormat": "JPEG", "quality": 95, "subsampling": "4:4:4", "optimize": True},
+        "small": {"imageFormat": "WEBP", "quality": 80, "optimize": True},
+        "lossless": {"imageFormat": "PNG", "compressLevel": 1}
+    }
+
+    def __init__(self, imageFormat = SOURCE, quality = 90, subsampling = "4:2:0", optimize = False, progressive = False, compressLevel = 6):
+        '''
+        Constructor function for the encoder, that writes the rendered wallpapers
+
+        Args:
+            imageFormat (string): "JPEG", "PNG", "BMP", "WEBP", or "SOURCE" to keep the format of the source wallpaper (with the defaults of PIL)
+            quality (int): JPEG / WebP quality, from 1 to 100
+            subsampling (string): JPEG chroma subsampling, "4:4:4", "4:2:2" or "4:2:0"
+            optimize (bool): Spend more time encoding for smaller files (JPEG / PNG Huffman tables, slowest WebP method)
+            progressive (bool): Write progressive JPEGs
+            compressLevel (int): PNG zlib compression level, from 0 (none, fastest) to 9
+
+        Raises:
+            ValueError: If the format is not supported, or a value is not valid
+        '''
+
+        imageFormat = str(imageFormat).upper()
+        if imageFormat != self.SOURCE and imageFormat not in self.EXTENSIONS:
+            raise ValueError(f"Unsupported output format '{imageFormat}'!")
+
+        #Checked here, so an invalid value is reported with the settings instead of failing inside a render
+        if not (isinstance(quality, int) and not isinstance(quality, bool) and 1 <= quality <= 100):
+            raise ValueError(f"The output quality needs to be a number from 1 to 100, not {quality!r}!")
+        if subsampling not in self.SUBSAMPLINGS:
+            raise ValueError(f"The output subsampling needs to be one of {', '.join(self.SUBSAMPLINGS)}, not {subsampling!r}!")
+        if not (isinstance(compressLevel, int) and not isinstance(compressLevel, bool) and 0 <= compressLevel <= 9):
+            raise ValueError(f"The PNG compression level needs to be a number from 0 to 9, not {compressLevel!r}!")
+        if not (isinstance(optimize, bool) and isinstance(progressive, bool)):
+            raise ValueError("The 'optimize' and 'progressive' output values need to be true or false!")
+
+        self.__format = imageFormat
+        self.__quality = quality
+        self.__subsampling = subsampling
+        self.__optimize = optimize
+        self.__progressive = progressive
+        self.__compressLevel = compressLevel
+
+    @classmethod
+    def from_preset(cls, name):
+        '''
+        Function that creates an encoder with the settings of the preset 'name'
+
+        Raises:
+            ValueError: If there is no preset with this name
+        '''
+
+        if name not in cls.PRESETS:
+            raise ValueError(f"Unknown output preset '{name}', the presets are: {', '.join(cls.PRESETS)}")
+
+        return cls(**cls.PRESETS[name])
+
+    @classmethod
+    def from_settings(cls, settings):
+        '''
+        Function that creates the encoder described by the [output] section of the settings: the
+        preset if one is chosen, the individual values otherwise
+
+        Raises:
+            ValueError: If the preset doesn't exist, or a value is not valid
+        '''
+
+        if settings.OUTPUT_PRESET:
+            return cls.from_preset(settings.OUTPUT_PRESET)
+
+        return cls(settings.OUTPUT_FORMAT, settings.OUTPUT_QUALITY, settings.OUTPUT_SUBSAMPLING, settings.OUTPUT_OPTIMIZE, settings.OUTPUT_PROGRESSIVE, settings.OUTPUT_COMPRESS_LEVEL)
+
+    def get_values(self):
+        '''
+        Function that returns every value that changes the encoded file
+        '''
+
+        return (self.__format, self.__quality, self.__subsampling, self.__optimize, self.__progressive, self.__compressLevel)
+
+    def get_extension(self, source_path):
+        '''
+        Function that returns the extension of the files written for the source wallpaper 'source_path'
+        '''
+
+        if self.__format == self.SOURCE:
+            return os.path.splitext(source_path)[1].lower()
+
+        return self.EXTENSIONS[self.__format]
+
+    def __get_options(self, imageFormat):
+        '''
+        Function that returns the arguments of 'Image.save' for the format 'imageFormat'
+        '''
+
+        if imageFormat == "JPEG":
+            return {"quality": self.__quality, "subsampling": self.__subsampling, "optimize": self.__optimize, "progressive": self.__progressive}
+        if imageFormat == "PNG":
+            return {"compress_level": self.__compressLevel, "optimize": self.__optimize}
+        if imageFormat == "WEBP":
+            return {"quality": self.__quality, "method": 6 if self.__optimize else 4}
+
+        return {}
+
+    def save(self, img, output_path):
+        '''
+        Function that encodes the image to a temporary file next to 'output_path', then renames it,
+        so a reader never sees a partially written wallpaper. The format is given by the extension
+        of 'output_path', only the formats chosen in the settings get the encoder options
+
+        Args:
+            img (PIL.Image): The image that will be saved
+            output_path (string): The path of the new file
+
+        Returns:
+            (int): The size of the written file, in bytes
+        '''
+
+        directory, filename = os.path.split(os.path.abspath(output_path))
+        extension = os.path.splitext(filename)[1]
+        imageFormat = Image.registered_extensions()[extension.lower()]
+        options = self.__get_options(imageFormat) if self.__format != self.SOURCE else {}
+
+        #JPEG has no alpha channel
+        if imageFormat == "JPEG" and img.mode != "RGB":
+            img = img.convert("RGB")
+
+        fileDescriptor, temporaryPath = tempfile.mkstemp(suffix=extension, prefix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fileDescriptor, "wb") as file:
+                img.save(file, format=imageFormat, **options)
+                size = file.tell()
+            os.replace(temporaryPath, output_path)
+        except BaseException:
+            os.remove(temporaryPath)
+            raise
+
+        return size
+
+    @staticmethod
+    def __to_palette(frame):
+        '''
+        Function that converts an RGBA frame to an adaptive palette for GIF, the mostly transparent
+        pixels use the last index of the palette
+
+        Returns:
+            (tuple): The palette image and the transparent index (None if no pixel is transparent)
+        '''
+
+        #The fast octree quantizer is several times faster than the median cut of PIL's conversion to "P"
+        transparent = frame.getchannel("A").point([255] * 128 + [0] * 128)
+        if transparent.getbbox() is None:
+            return frame.convert("RGB").quantize(256, Image.Quantize.FASTOCTREE), None
+
+        frame = frame.convert("RGB").quantize(255, Image.Quantize.FASTOCTREE)
+        palette = frame.getpalette()
+        frame.putpalette(palette + [0] * (768 - len(palette)))
+        frame.paste(255, mask=transparent)
+
+        return frame, 255
+
+    def save_animation(self, frames, output_path, loop = None):
+        '''
+        Function that writes an animated GIF one frame at a time, so only the frame that is being
+        encoded is kept in memory (saving with PIL keeps every frame until the end). The animation is
+        written to a temporary file next to 'output_path', then renamed
+
+        Every frame replaces the whole picture and has its own palette, so the encoder options don't
+        apply to animations
+
+        Args:
+            frames (iterable of tuples): (RGBA PIL.Image, duration in milliseconds) pairs, all with the same size
+            output_path (string): The path of the new file
+            loop (int): Number of times the animation is repeated (0 forever), None to play it once
+
+        Raises:
+            ValueError: If there are no frames
+
+        Returns:
+            (int): The size of the written file, in bytes
+        '''
+
+        directory, filename = os.path.split(os.path.abspath(output_path))
+        fileDescriptor, temporaryPath = tempfile.mkstemp(suffix=".gif", prefix=".tmp", dir=directory)
+
+        try:
+            with os.fdopen(fileDescriptor, "wb") as file:
+                for index, (frame, duration) in enumerate(frames):
+                    frame, transparency = self.__to_palette(frame)
+
+                    if index == 0:
+                        frame.info["version"] = b"89a" #Needed by the frame durations
+                        header, _ = GifImagePlugin.getheader(frame, info={} if loop is None else {"loop": loop})
+                        file.writelines(header)
+
+                    #Disposal 2: the area of the frame is cleared before the next one, which covers all of it
+                    params = {"duration": duration, "disposal": 2, "include_color_table": True}
+                    if transparency is not None:
+                        params["transparency"] = transparency
+                    file.writelines(GifImagePlugin.getdata(frame, **params))
+
+                if file.tell() == 0:
+                    raise ValueError("An animation needs at least one frame!")
+
+                file.write(b";") #Trailer
+                size = file.tell()
+            os.replace(temporaryPath, output_path)
+        except BaseException:
+            os.remove(temporaryPath)
+            raise
+
+        return size
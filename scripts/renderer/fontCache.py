@@ -0,0 +1,98 @@
+from collections import OrderedDict
+from PIL import ImageFont
+
+class FontCache:
+    def __init__(self, maxMetrics = 8192):
+        '''
+        Constructor function for the font cache, that keeps the loaded fonts and the
+        measured text bounding boxes, so repeated renders don't load or measure them again
+
+        Args:
+            maxMetrics (int): Maximum number of kept text measurements
+        '''
+
+        self.__fonts = {} #(path, size) -> font
+        self.__metrics = OrderedDict() #(path, size, text, anchor) -> bounding box (or length, with no anchor), from the least to the most recently used
+        self.__maxMetrics = maxMetrics
+
+    def get_font(self, path, size):
+        '''
+        Function that returns the font from 'path' at the pixel size 'size', loading it only once
+
+        Args:
+            path (string): The path (or name) of the TrueType font
+            size (int): The size of the font, in pixels
+
+        Returns:
+            (ImageFont): The font, or the default font if the file can't be loaded
+        '''
+
+        key = (path, size)
+
+        font = self.__fonts.get(key)
+        if font is None:
+            try:
+                font = ImageFont.truetype(path, size)
+            except IOError:
+                font = ImageFont.load_default(size)
+
+            self.__fonts[key] = font
+
+        return font
+
+    def get_bbox(self, font, text, anchor):
+        '''
+        Function that returns the bounding box of 'text' drawn with 'font' at the origin
+
+        Args:
+            font (ImageFont): The font of the text
+            text (string): The measured text
+            anchor (string): The anchor of the text (see PIL text anchors)
+
+        Returns:
+            (tuple of ints): The (left, top, right, bottom) box, relative to the anchor point
+        '''
+
+        key = (getattr(font, "path", None), font.size, text, anchor)
+
+        box = self.__metrics.get(key)
+        if box is not None:
+            self.__metrics.move_to_end(key)
+            return box
+
+        box = font.getbbox(text, anchor=anchor)
+
+        self.__metrics[key] = box
+        if len(self.__metrics) > self.__maxMetrics:
+            self.__metrics.popitem(last=False)
+
+        return box
+
+    def get_length(self, font, text):
+        '''
+        Function that returns the advance width of 'text' drawn with 'font', in pixels. The widths of
+        the words of a line add up to the width of the line
+
+        Args:
+            font (ImageFont): The font of the text
+            text (string): The measured text
+        '''
+
+        key = (getattr(font, "path", None), font.size, text, None) #A length instead of the box of an anchor
+
+        length = self.__metrics.get(key)
+        if length is not None:
+            self.__metrics.move_to_end(key)
+            return length
+
+        length = font.getlength(text)
+
+        self.__metrics[key] = length
+        if len(self.__metrics) > self.__maxMetrics:
+            self.__metrics.popitem(last=False)
+
+        return length
+
+    def clear(self):
+        self.__fonts.clear()
+        self.__metrics.clear()
@@ -0,0 +1,107 @@
+from collections import OrderedDict
+import os
+from PIL import Image
+
+class ImageCache:
+    def __init__(self, maxBytes = 512 * 1024 * 1024, targetSize = None):
+        '''
+        Constructor function for the decoded images cache, that keeps the decoded
+        wallpapers in memory, so they are read and decoded only once per process
+
+        Args:
+            maxBytes (int): Maximum total size of the kept decoded images
+            targetSize (tuple of ints): The (width, height) of the display, the images are decoded
+                                        and downscaled to cover it. None keeps the original size
+        '''
+
+        self.__maxBytes = maxBytes
+        self.__targetSize = targetSize
+
+        self.__images = OrderedDict() #key -> decoded image, from the least to the most recently used
+        self.__totalBytes = 0
+
+    def get(self, path):
+        '''
+        Function that returns the decoded image from 'path'. The returned image is shared,
+        so it needs to be copied before being modified
+
+        Args:
+            path (string): The path of the image
+
+        Returns:
+            (PIL.Image): The decoded image
+        '''
+
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+        img = self.__images.get(key)
+        if img is not None:
+            self.__images.move_to_end(key)
+            return img
+
+        img = self.__decode(path)
+
+        self.__images[key] = img
+        self.__totalBytes += self.__image_bytes(img)
+        self.__evict()
+
+        return img
+
+    def clear(self):
+        self.__images.clear()
+        self.__totalBytes = 0
+
+    def set_target_size(self, targetSize):
+        '''
+        Function that changes the size the images are decoded at (see the constructor), for example
+        after the settings changed. The images decoded at the previous size are dropped
+        '''
+
+        if targetSize != self.__targetSize:
+            self.__targetSize = targetSize
+            self.clear()
+
+    def __decode(self, path):
+        '''
+        Function that decodes the image from 'path'. When a target size is set, JPEG images use
+        the draft mode, so the decoder itself scales them down instead of decoding every pixel,
+        then the image is resized to the smallest size that still covers the target
+
+        Args:
+            path (string): The path of the image
+
+        Returns:
+            (PIL.Image): The decoded image
+        '''
+
+        with Image.open(path) as img:
+            if self.__targetSize is None:
+                img.load()
+                return img
+
+            targetWidth, targetHeight = self.__targetSize
+            scale = max(targetWidth / img.width, targetHeight / img.height)
+
+            if scale >= 1:
+                img.load()
+                return img
+
+            size = (round(img.width * scale), round(img.height * scale))
+            img.draft(img.mode, size) #Only JPEG supports it, the other formats ignore it
+
+            return img.resize(size, Image.Resampling.LANCZOS)
+
+    @staticmethod
+    def __image_bytes(img):
+        return img.width * img.height * len(img.getbands())
+
+    def __evict(self):
+        '''
+        Function that removes the least recently used images until the cache fits its limit,
+        the most recent image is always kept
+        '''
+
+        while len(self.__images) > 1 and self.__totalBytes > self.__maxBytes:
+            _, img = self.__images.popitem(last=False)
+            self.__totalBytes -= self.__image_bytes(img)
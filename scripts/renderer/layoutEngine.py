@@ -0,0 +1,215 @@
+class LayoutEngine:
+    PADDING = 4 #Pixels kept free on both sides of every line (the shadow is drawn 2 pixels to the right)
+    ELLIPSIS = "..."
+
+    def __init__(self, fontCache):
+        '''
+        Constructor function for the layout engine, that computes what is drawn in every column before
+        any pixel is drawn: the font size, where every event name is wrapped or cut to the width of its
+        column, and which lines fit on the image
+
+        When the events don't fit, the font is shrunk (down to the smallest size of the layout), then
+        the columns that still don't fit are split into sub-columns, and the events that are still
+        left out are replaced by a "+N more" line. So the number of drawn lines depends on the size of
+        the image, not on the number of events
+
+        Args:
+            fontCache (FontCache object): Cache of the loaded fonts and text measurements
+        '''
+
+        self.__fontCache = fontCache
+
+    def compute(self, layout, size, categorized_events):
+        '''
+        Function that computes the visible lines of every column of an image of size 'size'
+
+        Args:
+            layout (Layout object): The layout of the columns
+            size (tuple of ints): The (width, height) of the image
+            categorized_events (list): The events of every column
+
+        Returns:
+            (tuple): The font, and for every column the list of its lines, as (text, x, y, color, done)
+            tuples: 'x' is the horizontal center of the line and 'y' its top
+        '''
+
+        width, height = size
+        _, marginY, columnWidth, columnCenters, fontSize, minFontSize = layout.get_geometry(width, height)
+        columns = layout.get_columns()
+        events = [categorized_events[i] if i < len(categorized_events) else [] for i in range(len(columns))]
+
+        #Every event needs at least one line, so the events after the most lines that could be visible are never measured
+        maxRows = self.__get_rows(minFontSize, layout.get_lineSpacing(), marginY, height)
+        capacity = maxRows * layout.get_maxSubColumns()
+
+        #The words of the visible events are measured once, with the largest font, the other sizes are scaled from it
+        baseFont = self.__fontCache.get_font(layout.get_font(), fontSize)
+        space = self.__fontCache.get_length(baseFont, " ")
+        entries = [
+            [self.__measure(baseFont, f"{i}.{event.get_name()}") for i, event in enumerate(columnEvents[:capacity + 1], 1)]
+            for columnEvents in events
+        ]
+
+        def flow(column, size, subColumns):
+            return self.__flow(entries[column], len(events[column]), space, size, subColumns, layout, marginY, height, columnWidth, fontSize)
+
+        #The largest font with which every column fits (the heights of the lines shrink with the font)
+        low, high = minFontSize, fontSize
+        while low < high:
+            middle = (low + high + 1) // 2
+            if all(flow(column, middle, 1)[1] == 0 for column in range(len(columns))):
+                low = middle
+            else:
+                high = middle - 1
+        size = low
+
+        font = self.__fontCache.get_font(layout.get_font(), size)
+        lineHeight = size + layout.get_lineSpacing()
+        rows = self.__get_rows(size, layout.get_lineSpacing(), marginY, height)
+
+        result = []
+        for column, header in enumerate(columns):
+            #The fewest sub-columns the events fit in, or the most sub-columns (that are not too narrow)
+            subColumns = 1
+            placed, hidden = flow(column, size, 1)
+            while hidden and subColumns < layout.get_maxSubColumns() and columnWidth // (subColumns + 1) >= 4 * size:
+                subColumns += 1
+                placed, hidden = flow(column, size, subColumns)
+
+            left = columnCenters[column] - columnWidth // 2
+            subWidth = columnWidth // subColumns
+            color = layout.get_columnColor(column)
+
+            lines = [(self.__fit(font, header, columnWidth - 2 * self.PADDING), columnCenters[column], marginY, layout.get_headerColor(), False)]
+            sub, row = 0, 0
+
+            for index, ranges, sub, row in placed:
+                words = entries[column][index][0]
+                x = left + subWidth * sub + subWidth // 2
+
+                for line, (start, end) in enumerate(ranges):
+                    text = self.__fit(font, " ".join(words[start:end]), subWidth - 2 * self.PADDING)
+                    lines.append((text, x, marginY + (row + line + 1) * lineHeight, color, events[column][index].is_done()))
+
+                row += len(ranges)
+
+            if hidden and rows:
+                if row >= rows:
+                    sub, row = sub + 1, 0
+                x = left + subWidth * sub + subWidth // 2
+                lines.append((f"+{hidden} more", x, marginY + (row + 1) * lineHeight, color, False))
+
+            result.append(lines)
+
+        return font, result
+
+    @staticmethod
+    def __get_rows(size, lineSpacing, marginY, height):
+        '''
+        Function that returns how many lines fit under the header of a column, with a font of 'size' pixels
+        '''
+
+        lineHeight = size + lineSpacing
+        return max(0, (height - 2 * marginY - lineHeight) // lineHeight)
+
+    def __measure(self, font, text):
+        '''
+        Function that splits 'text' in words and measures each of them
+
+        Returns:
+            (tuple): The words and their widths
+        '''
+
+        words = text.split(" ")
+        return words, [self.__fontCache.get_length(font, word) for word in words]
+
+    @staticmethod
+    def __wrap(widths, space, maxWidth, maxLines):
+        '''
+        Function that wraps words to lines of at most 'maxWidth' (a word that is wider than that gets a line
+        of its own). If there would be more than 'maxLines' lines, the last one gets all the remaining words
+
+        Returns:
+            (list of tuples): The (start, end) indexes of the words of every line
+        '''
+
+        lines = []
+        start, lineWidth = 0, widths[0]
+
+        for i in range(1, len(widths)):
+            if lineWidth + space + widths[i] <= maxWidth:
+                lineWidth += space + widths[i]
+                continue
+
+            if len(lines) + 1 == maxLines:
+                break #The last line is cut when it's drawn
+
+            lines.append((start, i))
+            start, lineWidth = i, widths[i]
+
+        lines.append((start, len(widths)))
+        return lines
+
+    def __flow(self, entries, count, space, size, subColumns, layout, marginY, height, columnWidth, baseSize):
+        '''
+        Function that places the events of a column, in order, with a font of 'size' pixels: the lines of
+        an event are kept together, in the first sub-column that has room for them. If not every event
+        fits, the last line is kept for the "+N more" line
+
+        Args:
+            entries (list of tuples): The words and widths of the first events of the column, measured with a font of 'baseSize' pixels
+            count (int): The number of events of the column
+            space (float): The width of a space, measured like the words
+
+        Returns:
+            (tuple): A list of (index, word ranges, sub-column, row) tuples for the placed events, and the number of events that are not placed
+        '''
+
+        rows = self.__get_rows(size, layout.get_lineSpacing(), marginY, height)
+        maxWidth = (columnWidth // subColumns - 2 * self.PADDING) * baseSize / size #Compared with the widths measured with the base font
+
+        placed = []
+        sub, row = 0, 0
+
+        for index, (_, widths) in enumerate(entries):
+            ranges = self.__wrap(widths, space, maxWidth, layout.get_wrapLines())
+
+            if row + len(ranges) > rows:
+                sub, row = sub + 1, 0
+                if sub == subColumns or len(ranges) > rows:
+                    break
+
+            placed.append((index, ranges, sub, row))
+            row += len(ranges)
+
+        hidden = count - len(placed)
+
+        #The "+N more" line goes after the last placed line, events are left out until there is room for it
+        while hidden and placed:
+            _, ranges, sub, row = placed[-1]
+            if row + len(ranges) < rows or sub + 1 < subColumns:
+                break
+
+            placed.pop()
+            hidden += 1
+
+        return placed, hidden
+
+    def __fit(self, font, text, maxWidth):
+        '''
+        Function that cuts 'text' (and adds an ellipsis) if it's wider than 'maxWidth' with 'font'
+        '''
+
+        if self.__fontCache.get_length(font, text) <= maxWidth:
+            return text
+
+        #The longest beginning of the text that fits with the ellipsis
+        low, high = 0, len(text)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self.__fontCache.get_length(font, text[:middle].rstrip() + self.ELLIPSIS) <= maxWidth:
+                low = middle
+            else:
+                high = middle - 1
+
+        return text[:low].rstrip() + self.ELLIPSIS
@@ -0,0 +1,164 @@
+from collections import OrderedDict
+import hashlib
+import os
+
+class RenderCache:
+    def __init__(self, directory, settings, maxEntries = 16, maxBytes = 256 * 1024 * 1024):
+        '''
+        Constructor function for the render cache, that keeps the last rendered wallpapers
+        on disk, so an identical render can be reused instead of being drawn again
+
+        Args:
+            directory (string): Path of the directory where the rendered wallpapers are kept
+            settings (Settings object): The settings used by the renderer
+            maxEntries (int): Maximum number of kept renders
+            maxBytes (int): Maximum total size of the kept renders
+        '''
+
+        self.__directory = directory
+        self.__settings = settings
+        self.__maxEntries = maxEntries
+        self.__maxBytes = maxBytes
+
+        self.__entries = OrderedDict() #key -> (path, size), from the least to the most recently used
+        self.__totalBytes = 0
+
+        os.makedirs(self.__directory, exist_ok=True)
+        self.__load_existing_entries()
+
+    def __load_existing_entries(self):
+        '''
+        Function that indexes the renders kept by a previous run, ordered by their last use
+        '''
+
+        files = []
+        for entry in os.scandir(self.__directory):
+            if entry.is_file():
+                stat = entry.stat()
+                files.append((stat.st_mtime_ns, entry.path, stat.st_size))
+
+        for _, path, size in sorted(files):
+            key = os.path.splitext(os.path.basename(path))[0]
+            self.__entries[key] = (path, size)
+            self.__totalBytes += size
+
+        self.__evict()
+
+    def make_key(self, wallpaper, categorized_events):
+        '''
+        Function that computes the key of a render
+
+        Args:
+            wallpaper (Wallpaper object): The source wallpaper
+            categorized_events (list): The categorized events that are drawn over the wallpaper
+
+        Returns:
+            (string): A hash of the source image identity (path, modification time, size), of the
+            render and output settings and of the name and state of every drawn event
+        '''
+
+        stat = os.stat(wallpaper.get_path())
+
+        content = [
+            os.path.abspath(wallpaper.get_path()), stat.st_mtime_ns, stat.st_size,
+            self.__settings.get_render_values(), self.__settings.get_output_values(),
+            [[(event.get_name(), event.is_done()) for event in events] for events in categorized_events]
+        ]
+
+        return hashlib.sha256(repr(content).encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        '''
+        Function that returns the path of a kept render
+
+        Args:
+            key (string): The key of the render, computed by 'make_key'
+
+        Returns:
+            (string): The path of the render, or None if it isn't kept
+        '''
+
+        entry = self.__entries.get(key)
+        if entry is None:
+            return None
+
+        path = entry[0]
+        if not os.path.exists(path):
+            self.__remove(key)
+            return None
+
+        self.__entries.move_to_end(key)
+        os.utime(path) #The modification time keeps the order of use between runs
+
+        return path
+
+    def get_path(self, key, extension):
+        '''
+        Function that returns the path where the render with the key 'key' is kept, so the
+        renderer can write it there directly
+
+        Args:
+            key (string): The key of the render, computed by 'make_key'
+            extension (string): The extension of the rendered image
+        '''
+
+        return os.path.join(self.__directory, key + extension)
+
+    def store(self, key, path):
+        '''
+        Function that adds a new render to the cache. A render that isn't already at the
+        path given by 'get_path' is moved there (not copied)
+
+        Args:
+            key (string): The key of the render, computed by 'make_key'
+            path (string): The path of the render
+
+        Returns:
+            (string): The new path of the render
+        '''
+
+        destinationPath = self.get_path(key, os.path.splitext(path)[1])
+
+        if key in self.__entries:
+            self.__forget(key)
+
+        if os.path.abspath(path) != os.path.abspath(destinationPath):
+            os.replace(path, destinationPath)
+
+        size = os.path.getsize(destinationPath)
+        self.__entries[key] = (destinationPath, size)
+        self.__totalBytes += size
+
+        self.__evict()
+        return destinationPath
+
+    def clear(self):
+        '''
+        Function that removes all the kept renders
+        '''
+
+        for key in list(self.__entries):
+            self.__remove(key)
+
+    def __forget(self, key):
+        path, size = self.__entries.pop(key)
+        self.__totalBytes -= size
+
+        return path
+
+    def __remove(self, key):
+        path = self.__forget(key)
+
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def __evict(self):
+        '''
+        Function that removes the least recently used renders until the cache fits its limits,
+        the most recent render is always kept
+        '''
+
+        while len(self.__entries) > 1 and (len(self.__entries) > self.__maxEntries or self.__totalBytes > self.__maxBytes):
+            self.__remove(next(iter(self.__entries)))
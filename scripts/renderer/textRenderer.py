@@ -1,19 +1,63 @@
-from PIL import Image, ImageDraw, ImageFont
+from collections import OrderedDict
+from PIL import Image, ImageDraw, ImageSequence
 import os
+from .encoder import Encoder
+from .fontCache import FontCache
+from .layoutEngine import LayoutEngine
+from ..profiling import NULL_PROFILER
 
 class TextRenderer:
-    def __init__(self, config):
+    MAX_TILES = 32 #Number of column overlay tiles kept for reuse
+
+    def __init__(self, config, imageCache = None, fontCache = None, profiler = NULL_PROFILER, encoder = None):
+        '''
+        Constructor function for the text renderer
+
+        Args:
+            config (Settings object): The layout and style settings
+            imageCache (ImageCache object): Optional cache of decoded source images
+            fontCache (FontCache object): Cache of the loaded fonts and text measurements
+            profiler (Profiler object): Object that times the stages of the rendering
+            encoder (Encoder object): Object that writes the rendered wallpapers (defaulted to the format of the source, with the defaults of PIL)
+        '''
+
         self.__config = config
+        self.__imageCache = imageCache
+        self.__fontCache = fontCache if fontCache is not None else FontCache()
+        self.__layoutEngine = LayoutEngine(self.__fontCache)
+        self.__profiler = profiler
+        self.__encoder = encoder if encoder is not None else Encoder()
+        self.__tiles = OrderedDict() #Column overlay tiles, from the least to the most recently used
+
+    def set_encoder(self, encoder):
+        self.__encoder = encoder
+
+    def clear_caches(self):
+        '''
+        Function that drops the column tiles and the loaded fonts, for example after the settings
+        changed (they are keyed by the layout, so they would never be used again)
+        '''
+
+        self.__tiles.clear()
+        self.__fontCache.clear()
 
-    def add_text_to_wallpaper(self, image, path, categorized_events, output_suffix="with_text"):
+    def get_output_extension(self, source_path):
+        '''
+        Function that returns the extension of the wallpapers rendered from the source 'source_path'
         '''
-        Function that adds events (text) over the background image
+
+        return self.__encoder.get_extension(source_path)
+
+    def add_text_to_wallpaper(self, image, source, categorized_events, output_path):
+        '''
+        Function that adds events (text) over the background image and writes
+        the result to 'output_path'. The source image is never modified
         
         Args:
             image (Wallpaper object): The wallpaper object that will be modified
-            path (string): The path of the image that will be modified
+            source (string / PIL.Image): The path of the source image, or the already decoded image
             categorized_events (list): A list made of 3 lists, each one containing events categorized by their remaining days
-            output_suffix (string): The ending name of the file (defaulted to "with_text")
+            output_path (string): The path of the new file, its extension gives the image format (see 'get_output_extension')
         
         Raises:
             EventsRepoError: If the events list is empty
@@ -22,69 +66,166 @@ class TextRenderer:
             (string): The output path of the new file
         '''
 
-        img = Image.open(path)
-        draw = ImageDraw.Draw(img)
-        
-        # Image size
-        height = image.get_height()
-        width = image.get_width()
+        #Animated GIFs keep all of their frames when the output is a GIF too
+        if isinstance(source, str) and os.path.splitext(output_path)[1].lower() == ".gif":
+            with Image.open(source) as img:
+                if getattr(img, "is_animated", False):
+                    return self.__add_text_to_animation(img, categorized_events, output_path)
 
-        #Layout calculations
-        num_cols = len(self.__config.COLUMNS)
-        margin_x = int(width * self.__config.MARGIN_SIZE_X)
-        margin_y = int(height * self.__config.MARGIN_SIZE_Y)
-        column_width = (width - (2 * margin_x)) // num_cols
-        column_centers = [margin_x + (column_width // 2) + (column_width * i) for i in range(num_cols)]
+        with self.__profiler.span("load_image"):
+            if isinstance(source, Image.Image):
+                img = source.copy()
+            elif self.__imageCache is not None:
+                img = self.__imageCache.get(source).copy() #The cached image is shared, so it is never drawn on
+            else:
+                with Image.open(source) as img:
+                    img.load() #The decoded image stays usable after the file is closed
+
+        #The overlay is pasted with an alpha mask, which needs a true color image
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA" if "transparency" in img.info or img.mode in ("LA", "PA") else "RGB")
+
+        #Every column is drawn once to a transparent tile, then only the tiles are composited over the image
+        with self.__profiler.span("draw"):
+            for tile, position in self.__get_overlay(img.size, categorized_events):
+                img.paste(tile, position, tile)
 
-        #Style settings
-        line_spacing = self.__config.LINE_SPACING
-        text_color = self.__config.TEXT_COLOR
-        shadow_color = self.__config.SHADOW_COLOR
-        header_color = self.__config.HEADER_COLOR
-
-        #Font
-        try:
-            font = ImageFont.truetype(self.__config.FONT, int(height * self.__config.FONT_SIZE))
-        except IOError:
-            font = ImageFont.load_default()
-
-        for col_idx, (category, events) in enumerate(zip(self.__config.COLUMNS, categorized_events)):
-            x = column_centers[col_idx]
-            y = margin_y
-
-            #Draw category header
-            header_text = category
-            bbox = draw.textbbox((x, y), header_text, font=font, anchor="ma")
-            draw.text((x+2, y+2), header_text, font=font, fill=shadow_color, anchor="ma")
-            draw.text((x, y), header_text, font=font, fill=header_color, anchor="ma")
-            y += font.size + line_spacing
-
-            #Draw events in category
-            for i, event in enumerate(events, 1):
-                event_text = f"{i}.{event.get_name()}"
-                text_width = draw.textlength(event_text, font=font)
-
-                draw.text((x+2, y+2), event_text, font=font, fill=shadow_color, anchor="ma")
-                text_bbox = draw.textbbox((x, y), event_text, font=font, anchor="ma")
-                draw.text((x, y), event_text, font=font, fill=text_color[col_idx], anchor="ma")
-
-                if event.is_done():
-                    # Calculate line positions
-                    left, top, right, bottom = text_bbox
-                    strike_y = (top + bottom) // 2
-                    strike_color = text_color[col_idx]
-                    
-                    # Draw strike line (slightly thicker than text)
-                    draw.line(
-                        [(left, strike_y), (right, strike_y)],
-                        fill=strike_color,
-                        width=int(font.size * 0.15)  # Dynamic width based on font size
-                    )
-                    
-                y += font.size + line_spacing
-            
         # Save modified image
-        base, ext = os.path.splitext(path)
-        output_path = f"{base}{output_suffix}{ext}"
-        img.save(output_path)
-        return output_path
\ No newline at end of file
+        with self.__profiler.span("save"):
+            size = self.__encoder.save(img, output_path)
+
+        self.__count_render(categorized_events, size)
+        return output_path
+
+    def __add_text_to_animation(self, img, categorized_events, output_path):
+        '''
+        Function that draws the events over every frame of an animated image and writes it as a GIF,
+        keeping the duration of every frame and the loop count. The overlay is drawn once for all the
+        frames, and the frames are decoded, drawn on and encoded one at a time
+
+        Args:
+            img (PIL.Image): The opened animated image
+            categorized_events (list): The categorized events
+            output_path (string): The path of the new file
+
+        Returns:
+            (string): The output path of the new file
+        '''
+
+        with self.__profiler.span("draw"):
+            overlay = self.__get_overlay(img.size, categorized_events)
+
+        def frames():
+            for frame in ImageSequence.Iterator(img):
+                duration = frame.info.get("duration", 0)
+                frame = frame.convert("RGBA")
+
+                for tile, position in overlay:
+                    frame.paste(tile, position, tile)
+
+                yield frame, duration
+
+        #Decoding and drawing happen while the frames are encoded, so they are timed with the encoding
+        with self.__profiler.span("save"):
+            size = self.__encoder.save_animation(frames(), output_path, img.info.get("loop"))
+
+        self.__count_render(categorized_events, size)
+        return output_path
+
+    def __get_overlay(self, size, categorized_events):
+        '''
+        Function that computes the layout of the columns for an image of size 'size'
+
+        Returns:
+            (list of tuples): The RGBA tile of every column and the (x, y) position where it's pasted over the image
+        '''
+
+        #The layout is read once, so the whole image is drawn with it even if the settings are loaded again meanwhile
+        layout = self.__config.LAYOUT
+
+        #Only the lines that fit on the image are drawn, however many events there are
+        with self.__profiler.span("layout"):
+            font, columns = self.__layoutEngine.compute(layout, size, categorized_events)
+
+        if self.__profiler.enabled:
+            self.__profiler.count("lines_drawn", sum(len(lines) for lines in columns))
+
+        return [self.__get_column_tile(layout, lines, font) for lines in columns]
+
+    def __count_render(self, categorized_events, size):
+        if self.__profiler.enabled:
+            self.__profiler.count("events_drawn", sum(len(events) for events in categorized_events[:len(self.__config.LAYOUT.get_columns())]))
+            self.__profiler.count("bytes_written", size)
+
+    def __get_column_tile(self, layout, lines, font):
+        '''
+        Function that returns the overlay tile of a column, drawing it only if the same lines (same
+        texts, positions, colors and font) weren't drawn before with the same layout
+
+        Args:
+            layout (Layout object): The layout of the columns
+            lines (list of tuples): The (text, x, y, color, done) lines of the column, computed by the layout engine
+            font (ImageFont): The font of the text
+
+        Returns:
+            (tuple): The RGBA tile and the (x, y) position where it's pasted over the image
+        '''
+
+        key = (tuple(lines), getattr(font, "path", None), font.size, layout)
+
+        tile = self.__tiles.get(key)
+        if tile is not None:
+            self.__tiles.move_to_end(key)
+            return tile
+
+        tile = self.__draw_column_tile(layout, lines, font)
+
+        self.__tiles[key] = tile
+        if len(self.__tiles) > self.MAX_TILES:
+            self.__tiles.popitem(last=False)
+
+        return tile
+
+    def __draw_column_tile(self, layout, lines, font):
+        '''
+        Function that draws the lines of a column on a transparent tile that covers only the
+        bounding box of the column text (shadows and strike lines included)
+
+        Returns:
+            (tuple): The RGBA tile and the (x, y) position where it's pasted over the image
+        '''
+
+        #Style settings
+        shadow_color = layout.get_shadowColor()
+        strike_width = int(font.size * 0.15) # Dynamic width based on font size
+
+        #Bounding box of the whole column, the shadow is drawn 2 pixels lower and to the right
+        boxes = [self.__fontCache.get_bbox(font, text, "ma") for text, _, _, _, _ in lines]
+        padding = 2 + strike_width
+        left = min(line[1] + box[0] for line, box in zip(lines, boxes)) - padding
+        top = min(line[2] + box[1] for line, box in zip(lines, boxes)) - padding
+        right = max(line[1] + box[2] for line, box in zip(lines, boxes)) + padding
+        bottom = max(line[2] + box[3] for line, box in zip(lines, boxes)) + padding
+
+        tile = Image.new("RGBA", (right - left, bottom - top), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(tile)
+
+        for (text, x, y, color, done), box in zip(lines, boxes):
+            x -= left
+            y -= top
+
+            draw.text((x+2, y+2), text, font=font, fill=shadow_color, anchor="ma")
+            draw.text((x, y), text, font=font, fill=color, anchor="ma")
+
+            if done:
+                # Calculate line positions, from the already measured box
+                strike_y = y + (box[1] + box[3]) // 2
+
+                # Draw strike line (slightly thicker than text)
+                draw.line(
+                    [(x + box[0], strike_y), (x + box[2], strike_y)],
+                    fill=color,
+                    width=strike_width
+                )
+
+        return tile, (left, top)
@@ -0,0 +1,86 @@
+import datetime
+import time
+from .utils import EventsRepoError
+
+class Scheduler:
+    RETRY_SECONDS = 60 #Wait before trying again after the wallpaper couldn't be set
+
+    def __init__(self, service, wallpaper, clock = datetime.datetime.now, sleep = time.sleep, errorCallback = None):
+        '''
+        Constructor function for the scheduler, that keeps the wallpaper up to date without
+        any user interaction: it sleeps until the next date on which the categorized events
+        change (midnight of that day), then renders the wallpaper again. If the wallpaper can't be
+        set (no events yet, a file that can't be read or written), it's tried again after RETRY_SECONDS
+
+        Args:
+            service (Service object): Object that renders and sets the wallpaper
+            wallpaper (Wallpaper object): The wallpaper the events are drawn over
+            clock (function): Function that returns the current datetime.datetime
+            sleep (function): Function that sleeps the given number of seconds
+            errorCallback (function): Optional function called with the exception when the wallpaper couldn't be set
+        '''
+
+        self.__service = service
+        self.__wallpaper = wallpaper
+        self.__clock = clock
+        self.__sleep = sleep
+        self.__errorCallback = errorCallback
+
+    def run_once(self):
+        '''
+        Function that sets the wallpaper, if it changed since the last time it was set,
+        then computes when it needs to be set again
+
+        Returns:
+            (datetime.datetime): The moment of the next change, or None if there is no next change
+        '''
+
+        today = self.__clock().date()
+
+        self.__service.create_set_wallpaper(self.__wallpaper, force=False, today=today)
+
+        nextChange = self.__service.get_next_change(today)
+        if nextChange is None:
+            return None
+
+        return datetime.datetime.combine(nextChange, datetime.time.min)
+
+    def sleep_until(self, moment):
+        '''
+        Function that sleeps until 'moment'. The sleep is repeated only if it ended early
+        (for example after the computer was suspended)
+
+        Args:
+            moment (datetime.datetime): The moment the function returns at
+        '''
+
+        remaining = (moment - self.__clock()).total_seconds()
+
+        while remaining > 0:
+            self.__sleep(remaining)
+            remaining = (moment - self.__clock()).total_seconds()
+
+    def run(self, iterations = None):
+        '''
+        Function that runs the main loop of the scheduler. When no change is coming (no events, or only
+        done and overdue ones), it checks again at the next midnight, events can be added meanwhile
+
+        Args:
+            iterations (int): Maximum number of renders (defaulted to no limit)
+        '''
+
+        while iterations is None or iterations > 0:
+            try:
+                nextChange = self.run_once()
+            except (EventsRepoError, OSError) as e:
+                if self.__errorCallback is not None:
+                    self.__errorCallback(e)
+                nextChange = self.__clock() + datetime.timedelta(seconds=self.RETRY_SECONDS)
+
+            if nextChange is None:
+                nextChange = datetime.datetime.combine(self.__clock().date() + datetime.timedelta(days=1), datetime.time.min)
+
+            self.sleep_until(nextChange)
+
+            if iterations is not None:
+                iterations -= 1
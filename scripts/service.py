@@ -1,20 +1,79 @@
-import os
+from .DOMAIN.event import Event
+from .profiling import NULL_PROFILER
+from .REPO.eventsFormats import read_events, write_events
+from .utils import EventsRepoError
+import threading
 
 class Service:
-    def __init__(self, eventService, wallpaperService, wallpaperSys, textRenderer):
+    def __init__(self, eventService, wallpaperService, wallpaperSys, textRenderer, renderCache, batchRenderer = None, profiler = NULL_PROFILER, settings = None):
         '''
         Constructor function for service object
         
         Args:
-            validator (Validator object): Object that validates events
-            repo (Repo object): Object that stores and manages the data of all events
-            eventFactory (Event class): Constructor for objects of type 'Event'
+            eventService (EventService object): Object that manages the events
+            wallpaperService (WallpaperService object): Object that manages the available wallpapers
+            wallpaperSys (WallpaperSys object): Object that handles OS-level wallpaper operations
+            textRenderer (TextRenderer object): Object that draws the events over a wallpaper
+            renderCache (RenderCache object): Object that keeps the rendered wallpapers for reuse
+            batchRenderer (BatchRenderer object): Object that renders several wallpapers / resolutions in parallel
+            profiler (Profiler object): Object that times the stages of the wallpaper creation
+            settings (Settings object): Optional settings that are loaded again (if their file changed) before every render
         '''
 
         self.__eventService = eventService
         self.__wallpaperService = wallpaperService
         self.__wallpaperSys = wallpaperSys
         self.__textRenderer = textRenderer
+        self.__renderCache = renderCache
+        self.__batchRenderer = batchRenderer
+        self.__profiler = profiler
+        self.__settings = settings
+        self.__appliedKey = None #The render key of the wallpaper that is currently set
+        self.__appliedWallpaper = None #The source of the wallpaper that is currently set
+        #The events and the settings can be used from other threads (see RenderWorker): the lock is held while they are read or changed
+        self.__lock = threading.RLock()
+        #A render only holds the first lock while it copies the events, this one keeps the settings and the renderer unchanged until it's done
+        self.__renderLock = threading.RLock()
+
+    def subscribe(self, listener):
+        '''
+        Function that registers a function that is called (without arguments) after every change of the events
+
+        Args:
+            listener (callable): The function that will be called
+        '''
+
+        self.__eventService.subscribe(listener)
+
+    def flush(self):
+        '''
+        Function that writes the changes of the events that are not written yet
+        '''
+
+        with self.__lock:
+            self.__eventService.flush()
+
+    def refresh_settings(self):
+        '''
+        Function that loads the settings again if their file changed. The listeners of the settings
+        are called here, so they never run while a wallpaper is created (it waits for the running render)
+
+        Returns:
+            (bool): True if the settings changed
+        '''
+
+        if self.__settings is None:
+            return False
+
+        with self.__renderLock, self.__lock:
+            return self.__settings.refresh()
+
+    def get_applied_wallpaper(self):
+        '''
+        Function that returns the source (Wallpaper object) of the wallpaper that was set last, or None
+        '''
+
+        return self.__appliedWallpaper
 
     def get_events(self):
         '''
@@ -24,10 +83,11 @@ class Service:
             EventRepoError: If the list of events is empty
 
         Returns:
-            list (of events): The list that contains all of the current event objects
+            list (of events): The list that contains a copy of all of the current event objects
         '''
 
-        return self.__eventService.get_events()
+        with self.__lock:
+            return [Event.from_event(el) for el in self.__eventService.get_events()]
 
     def delete_event(self, index):
         '''
@@ -37,7 +97,8 @@ class Service:
             index (int): The index of the element that will be deleted
         '''
 
-        self.__eventService.delete_event(index)
+        with self.__lock:
+            self.__eventService.delete_event(index)
 
     def add_event(self, name, description, startingDate, endingDate):
         '''
@@ -54,7 +115,48 @@ class Service:
             ValidationError: If the parameters are not valid (empty strings / starting date after ending date)
         '''
 
-        self.__eventService.add_event(name, description, startingDate, endingDate)
+        with self.__lock:
+            self.__eventService.add_event(name, description, startingDate, endingDate)
+
+    def import_events(self, path):
+        '''
+        Function that adds all the valid events of a CSV, JSON lines or iCalendar file, with a single write
+
+        Args:
+            path (string): The path of the file, its extension gives the format
+
+        Raises:
+            ValueError: If the file type is not supported, or the file can't be read
+            OSError: If the file can't be opened
+
+        Returns:
+            (tuple): The number of added events and a list of (position, message) pairs for the rejected records
+        '''
+
+        with self.__lock:
+            return self.__eventService.import_events(read_events(path))
+
+    def export_events(self, path):
+        '''
+        Function that writes all the events to a CSV, JSON lines or iCalendar file
+
+        Args:
+            path (string): The path of the file, its extension gives the format
+
+        Raises:
+            ValueError: If the file type is not supported
+
+        Returns:
+            (int): The number of written events
+        '''
+
+        with self.__lock:
+            try:
+                events = self.__eventService.get_events()
+            except EventsRepoError:
+                events = []
+
+            return write_events(path, events)
 
     def mark_event_as_done(self, index):
         '''
@@ -64,7 +166,8 @@ class Service:
             index (int): The index of the element that will be markes as done
         '''
 
-        self.__eventService.mark_as_done(index)
+        with self.__lock:
+            self.__eventService.mark_as_done(index)
 
     def get_available_wallpapers(self):
         '''
@@ -76,27 +179,93 @@ class Service:
 
         return self.__wallpaperService.get_wallpapers()
 
-    def create_set_wallpaper(self, image):
+    def get_next_change(self, today = None):
         '''
-        Function that removes all the files from the temp folder,
-        creates a new wallpaper with TODOs text written over it
-        and sets it as wallpaper
+        Function that returns the first date after 'today' on which the categorized events change
+
+        Returns:
+            (datetime.date): The date of the next change, or None if the categories never change again
+        '''
+
+        with self.__lock:
+            return self.__eventService.get_next_change(today)
+
+    def __get_categorized_events(self, today = None):
+        '''
+        Function that loads the settings again if needed, then returns a copy of the categorized
+        events, so they can be drawn without holding the lock
+        '''
+
+        with self.__lock:
+            self.refresh_settings()
+
+            with self.__profiler.span("get_categorized_events"):
+                return [[Event.from_event(el) for el in events] for events in self.__eventService.get_categorized_events(today)]
+
+    def create_set_wallpaper(self, image, force = True, today = None):
+        '''
+        Function that creates a new wallpaper with TODOs text written over it
+        and sets it as wallpaper. If an identical wallpaper was
+        already rendered, the kept render is set instead
 
         Args:
             image (Wallpaper object): The wallpaper object that will be modified and set as wallpaper
+            force (bool): If False, nothing is done when the same wallpaper is already set
+            today (datetime.date): The date the events are categorized from (defaulted to the current date)
         
         Raises:
             EventsRepoError: If the list of events is empty
+
+        Returns:
+            (bool): True if the wallpaper was set
+        '''
+
+        with self.__renderLock:
+            categorizedEvents = self.__get_categorized_events(today)
+
+            with self.__profiler.span("render_cache_key"):
+                key = self.__renderCache.make_key(image, categorizedEvents)
+            if not force and key == self.__appliedKey:
+                return False
+
+            #If the same wallpaper was already rendered with the same events and settings, it is reused
+            with self.__profiler.span("render_cache_lookup"):
+                cachedWallpaper = self.__renderCache.get(key)
+            if cachedWallpaper is not None:
+                with self.__profiler.span("load_wallpaper"):
+                    self.__wallpaperSys.load_wallpaper(cachedWallpaper)
+                self.__appliedKey = key
+                self.__appliedWallpaper = image
+                return True
+
+            #Creating the modified image, with text over it, directly inside the render cache
+            outputPath = self.__renderCache.get_path(key, self.__textRenderer.get_output_extension(image.get_path()))
+            with self.__profiler.span("render"):
+                textWallpaper = self.__textRenderer.add_text_to_wallpaper(image, image.get_path(), categorizedEvents, outputPath)
+
+            #Adding the new wallpaper to the render cache, then loading it
+            with self.__profiler.span("render_cache_store"):
+                textWallpaper = self.__renderCache.store(key, textWallpaper)
+            with self.__profiler.span("load_wallpaper"):
+                self.__wallpaperSys.load_wallpaper(textWallpaper)
+            self.__appliedKey = key
+            self.__appliedWallpaper = image
+            return True
+
+    def create_wallpapers(self, jobs):
         '''
+        Function that creates a wallpaper with TODOs text written over it for every job,
+        for example one for each monitor of a machine. The wallpapers are not set
 
-        #Removing all files from "temp" directory
-        self.__wallpaperSys.remove_files_from_dir("temp")
+        Args:
+            jobs (list of tuples): (Wallpaper object, (width, height)) pairs
 
-        #Creating a copy of the image inside "temp" directory
-        copyPath = self.__wallpaperSys.copy_wallpaper(image.get_path(), "temp")
+        Raises:
+            EventsRepoError: If the list of events is empty
 
-        #Creating the modified image, with text over it, inside "temp" directory
-        textWallpaper = self.__textRenderer.add_text_to_wallpaper(image, copyPath, self.__eventService.get_categorized_events())
+        Returns:
+            (list of strings): The paths of the created wallpapers, in the order of the jobs
+        '''
 
-        #Loading the new, modified wallpaper
-        self.__wallpaperSys.load_wallpaper(textWallpaper)
\ No newline at end of file
+        with self.__renderLock:
+            return self.__batchRenderer.render(jobs, self.__get_categorized_events())
\ No newline at end of file
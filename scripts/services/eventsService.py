@@ -1,11 +1,56 @@
 import datetime
+import itertools
+from ..utils import EventsRepoError, ValidationError
 
 class EventService:
-    def __init__(self, repo, validator, eventFactory):
+    BUCKET_DAYS = [1, 7] #Upper limits (in remaining days) of the first categories, the last category has no limit
+    IMPORT_BATCH_SIZE = 1000 #Number of records that are parsed and validated at once during an import
+
+    def __init__(self, repo, validator, eventFactory, bucketDays = BUCKET_DAYS):
+        '''
+        Constructor function for the events service
+
+        Args:
+            repo (EventsRepo object): Object that stores the events
+            validator (Validator object): Object that validates events
+            eventFactory (Event class): Constructor for objects of type 'Event'
+            bucketDays (list of ints): Increasing upper limits (in remaining days) of the categories, the last category has no limit
+        '''
+
         self.__repo = repo
         self.__validator = validator
         self.__eventFactory = eventFactory
+        self.__bucketDays = list(bucketDays)
+        self.__listeners = [] #Functions called after every change of the events
     
+    def set_bucket_days(self, bucketDays):
+        '''
+        Function that changes the limits of the categories, for example after the settings changed
+        '''
+
+        self.__bucketDays = list(bucketDays)
+
+    def subscribe(self, listener):
+        '''
+        Function that registers a function that is called (without arguments) after every change of the events
+
+        Args:
+            listener (callable): The function that will be called
+        '''
+
+        self.__listeners.append(listener)
+
+    def __notify(self):
+        for listener in self.__listeners:
+            listener()
+
+    def flush(self):
+        '''
+        Function that writes the changes the repo kept in memory (see the write-behind option of the repos)
+        '''
+
+        self.__repo.flush()
+
     def get_events(self):
         '''
         Function that returns a list of current events
@@ -38,7 +83,80 @@ class EventService:
         self.__validator.validate_event(event)
 
         self.__repo.add_event(event)
+        self.__notify()
     
+    def import_events(self, records, batchSize = IMPORT_BATCH_SIZE):
+        '''
+        Function that adds many events at once: the records are converted and validated in batches
+        while they are read, and the valid events are added to the repo with a single write
+
+        Args:
+            records (iterable of dicts): Records with the keys "name", "description", "startingDate", "endingDate" (iso-format
+            strings), "done" (optional), "position" (optional, used in the error messages) and "error" (optional, the record
+            couldn't be read)
+            batchSize (int): Number of records that are validated at once
+
+        Returns:
+            (tuple): The number of added events and a list of (position, message) pairs for the rejected records
+        '''
+
+        rejected = []
+        added = 0
+
+        def valid_events():
+            nonlocal added
+
+            iterator = iter(records)
+            while True:
+                batch = list(itertools.islice(iterator, batchSize))
+                if not batch:
+                    return
+
+                valid = []
+                for record in batch:
+                    try:
+                        valid.append(self.__create_event(record))
+                    except ValidationError as e:
+                        rejected.append((record.get("position"), str(e)))
+
+                added += len(valid)
+                yield from valid
+
+        self.__repo.add_events(valid_events())
+
+        if added:
+            self.__notify()
+
+        return added, rejected
+
+    def __create_event(self, record):
+        '''
+        Function that creates and validates the event of an import record
+
+        Raises:
+            ValidationError: If the record couldn't be read, or the event is not valid
+        '''
+
+        if "error" in record:
+            raise ValidationError(record["error"])
+
+        try:
+            startingDate = datetime.date.fromisoformat(record["startingDate"])
+            endingDate = datetime.date.fromisoformat(record["endingDate"])
+            done = record.get("done", False)
+            if not isinstance(done, bool):
+                done = {"true": True, "1": True, "yes": True, "false": False, "0": False, "no": False, "": False}[str(done).strip().lower()]
+        except KeyError as e:
+            raise ValidationError(f"Missing or invalid value {e}!")
+        except ValueError:
+            raise ValidationError("Invalid date or format!")
+
+        event = self.__eventFactory(record.get("name", ""), record.get("description", ""), startingDate, endingDate)
+        self.__validator.validate_event(event)
+        if done: event.set_as_done()
+
+        return event
+
     def delete_event(self, index):
         '''
         Function that deletes the event with the index 'index'
@@ -48,6 +166,7 @@ class EventService:
         '''
 
         self.__repo.delete_event(index)
+        self.__notify()
     
     def mark_as_done(self, index):
         '''
@@ -58,29 +177,70 @@ class EventService:
         '''
 
         self.__repo.mark_as_done(index)
+        self.__notify()
 
-    def get_categorized_events(self):
+    def get_categorized_events(self, today = None):
         '''
-        Function that returns three lists of events, based
-        on their remaining time until their ending (<1day/<1week/1week<)
+        Function that returns one list of events for every category, based
+        on their remaining time until their ending (<1day/<1week/1week< by default)
+
+        The split is done by the repo, so a database backed repo can use indexed range queries.
+        Events that are done and already ended are left out, like the repo does when it loads them
+
+        Args:
+            today (datetime.date): The date the remaining time is computed from (defaulted to the current date)
 
         Raises:
             EventsRepoError: If the list of events is empty
 
         Returns:
-            list (event objects): Three lists of events, categorized by their remaining time (<1day/<1week/1week<)
+            list (event objects): Lists of events, categorized by their remaining time, one more than the bucket limits
         '''
 
-        categorizedEvents = [[], [], []]
-        events = self.__repo.get_events()
+        if today is None:
+            today = datetime.date.today()
+
+        boundaries = [today + datetime.timedelta(days=days) for days in self.__bucketDays]
 
+        categorizedEvents = self.__repo.get_events_by_deadline(boundaries)
+        categorizedEvents[0] = [el for el in categorizedEvents[0] if not (el.is_done() and today > el.get_endingDate())]
+
+        if not any(categorizedEvents):
+            raise EventsRepoError("No existing events yet!")
+
+        return categorizedEvents
+
+    def get_next_change(self, today = None):
+        '''
+        Function that returns the first date after 'today' on which the categorized events
+        change: an event moves to another category, or a done event ends and is left out
+
+        Args:
+            today (datetime.date): The current date (defaulted to the current date)
+
+        Returns:
+            (datetime.date): The date of the next change, or None if the categories never change again
+        '''
+
+        if today is None:
+            today = datetime.date.today()
+
+        try:
+            events = self.__repo.get_events()
+        except EventsRepoError:
+            return None
+
+        nextChange = None
         for el in events:
-            remainingDays = (el.get_endingDate() - datetime.date.today()).days
-            if remainingDays <= 1:
-                categorizedEvents[0] += [el]
-            elif remainingDays <= 7:
-                categorizedEvents[1] += [el]
-            else:
-                categorizedEvents[2] += [el]
-        
-        return categorizedEvents
\ No newline at end of file
+            endingDate = el.get_endingDate()
+
+            #An event enters the category with the limit 'days' on its ending date minus 'days'
+            changes = [endingDate - datetime.timedelta(days=days) for days in self.__bucketDays]
+            if el.is_done():
+                changes.append(endingDate + datetime.timedelta(days=1))
+
+            for change in changes:
+                if change > today and (nextChange is None or change < nextChange):
+                    nextChange = change
+
+        return nextChange
\ No newline at end of file
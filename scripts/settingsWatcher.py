@@ -0,0 +1,41 @@
+import threading
+
+class SettingsWatcher:
+    def __init__(self, service, interval, callback, errorCallback = None):
+        '''
+        Constructor function for the settings watcher, that checks the settings file every 'interval'
+        seconds on a background thread, and calls 'callback' after the settings changed
+
+        Args:
+            service (Service object): The service that loads the settings again
+            interval (float): Seconds between two checks, 0 to never check
+            callback (callable): The function called (without arguments) after the settings changed, for example one that renders the wallpaper again
+            errorCallback (callable): Optional function called with the exception when a check fails, the watcher keeps checking
+        '''
+
+        self.__service = service
+        self.__interval = interval
+        self.__callback = callback
+        self.__errorCallback = errorCallback
+        self.__stopped = threading.Event()
+        self.__thread = None
+
+    def start(self):
+        if self.__interval > 0 and self.__thread is None:
+            self.__thread = threading.Thread(target=self.__run, name="SettingsWatcher", daemon=True)
+            self.__thread.start()
+
+    def close(self):
+        self.__stopped.set()
+
+        if self.__thread is not None:
+            self.__thread.join()
+
+    def __run(self):
+        while not self.__stopped.wait(self.__interval):
+            try:
+                if self.__service.refresh_settings():
+                    self.__callback()
+            except Exception as e:
+                if self.__errorCallback is not None:
+                    self.__errorCallback(e)
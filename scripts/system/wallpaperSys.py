@@ -1,6 +1,5 @@
 import os
 import ctypes
-import shutil
 
 class WallpaperSys:
     """Handles OS-level wallpaper operations"""
@@ -21,30 +20,10 @@ class WallpaperSys:
 
         files = os.listdir(dir)
         for file in files:
-            file_path = os.path.join("temp", file)
+            file_path = os.path.join(dir, file)
             if os.path.isfile(file_path):
                 os.remove(file_path)
 
-    @staticmethod
-    def copy_wallpaper(wallpaperPath, directoryPath = "wallpapers"):
-        '''
-        Function that creates a copy of the current wallpaper to a new destination
-        
-        Args:
-            wallpaperPath (string): Path of current wallpaper
-            directoryPath (string): Path of where the wallpaper will be copied
-        '''
-        
-        #Create destinationation directory if it doesen't exist
-        directoryPath = os.path.expanduser(directoryPath)
-        os.makedirs(directoryPath, exist_ok=True)
-        
-        #For now it will only be wallpaper.jpg
-        destinationPath = os.path.join(directoryPath, "wallpaper.jpg")
-
-        shutil.copy2(wallpaperPath, destinationPath)
-        return destinationPath
-
     @staticmethod
     def get_wallpaper_path() -> str:
         '''
@@ -108,4 +87,31 @@ class WallpaperSys:
         )
 
         if not result:
-            raise ctypes.WinError()
\ No newline at end of file
+            raise ctypes.WinError()
+
+class LocalWallpaperSys(WallpaperSys):
+    """Stand-in for WallpaperSys that records the loaded wallpapers instead of calling the OS"""
+
+    def __init__(self):
+        self.__loaded = []
+
+    def load_wallpaper(self, new_image):
+        '''
+        Function that records the modified wallpaper as loaded
+
+        Args:
+            new_image (string): The path of the image that needs to be loaded
+        '''
+
+        #Ensure the path exists
+        if not os.path.exists(new_image):
+            raise FileNotFoundError(f"The image file '{new_image}' does not exist.")
+
+        self.__loaded.append(os.path.abspath(new_image))
+
+    def get_loaded_wallpapers(self):
+        '''
+        Function that returns the paths of the loaded wallpapers, from the first to the last one
+        '''
+
+        return self.__loaded
@@ -0,0 +1,82 @@
+'''
+Tool that converts events between the text data file format and the binary snapshot format,
+the format of each file is given by its extension ('.bin' for snapshots)
+
+Usage: python -m scripts.tools.convertEvents data/events.txt data/events.bin
+       python -m scripts.tools.convertEvents data/events.bin data/events.txt
+'''
+
+import argparse
+import contextlib
+import os
+from ..REPO.eventsRepo import EventsRepo
+from ..REPO.eventsSnapshot import SnapshotError, write_snapshot
+from ..utils import EventsRepoError
+
+def write_text(filename, events):
+    '''
+    Function that writes the events to an events data file (text format), through a temporary file
+    that then replaces 'filename'
+
+    Raises:
+        EventsRepoError: If a name or a description contains a comma or a newline, which the text format can't store
+    '''
+
+    temporaryFilename = filename + ".tmp"
+
+    try:
+        with open(temporaryFilename, "w") as file:
+            for el in events:
+                name, description = el.get_name(), el.get_description()
+                if any(character in name + description for character in ",\n"):
+                    raise EventsRepoError(f"The event '{name}' can't be stored in the text format!")
+
+                file.write(f"{name},{description},{el.get_startingDate().isoformat()},{el.get_endingDate().isoformat()},{el.is_done()}\n")
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(temporaryFilename)
+        raise
+
+    os.replace(temporaryFilename, filename)
+
+def convert(source, destination):
+    '''
+    Function that copies the events of 'source' to 'destination', each one in the format given by its
+    extension. The source is loaded with 'EventsRepo', so the changes that are still only in its journal
+    are converted too
+
+    Raises:
+        EventsRepoError: If the source can't be loaded, or an event can't be stored in the text format
+        SnapshotError: If the source is not a valid snapshot
+
+    Returns:
+        (int): The number of converted events
+    '''
+
+    repo = EventsRepo(source)
+    try:
+        try:
+            events = repo.get_events()
+        except EventsRepoError:
+            events = []
+
+        if os.path.splitext(destination)[1].lower() == EventsRepo.BINARY_EXTENSION:
+            write_snapshot(destination, events)
+        else:
+            write_text(destination, events)
+    finally:
+        repo.close()
+
+    return len(events)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert events between the text format and the binary snapshot format")
+    parser.add_argument("source")
+    parser.add_argument("destination")
+    arguments = parser.parse_args()
+
+    try:
+        count = convert(arguments.source, arguments.destination)
+        print(f"Converted {count} events to '{arguments.destination}'")
+    except (EventsRepoError, SnapshotError, OSError) as e:
+        print(e)
@@ -0,0 +1,54 @@
+'''
+Tool that converts an existing events data file into a SQLite events database
+
+Usage: python -m scripts.tools.migrateEvents [events.txt] [events.db]
+'''
+
+import argparse
+import os
+from ..REPO.eventsRepo import EventsRepo
+from ..REPO.sqliteEventsRepo import SqliteEventsRepo
+from ..utils import EventsRepoError
+
+def migrate(textFilename, databaseFilename):
+    '''
+    Function that copies all the events from the events data file into the database
+
+    Args:
+        textFilename (string): Path of the events data file
+        databaseFilename (string): Path of the SQLite database, it is created if it doesn't exist
+
+    Raises:
+        EventsRepoError: If the database already contains events
+
+    Returns:
+        (int): The number of migrated events
+    '''
+
+    try:
+        events = EventsRepo(textFilename).get_events()
+    except EventsRepoError:
+        events = []
+
+    database = SqliteEventsRepo(databaseFilename)
+    try:
+        if database.count():
+            raise EventsRepoError(f"The database '{databaseFilename}' already contains events!")
+
+        database.add_events(events)
+    finally:
+        database.close()
+
+    return len(events)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert an events data file into a SQLite events database")
+    parser.add_argument("source", nargs="?", default=os.path.join("data", "events.txt"))
+    parser.add_argument("destination", nargs="?", default=os.path.join("data", "events.db"))
+    arguments = parser.parse_args()
+
+    try:
+        count = migrate(arguments.source, arguments.destination)
+        print(f"Migrated {count} events to '{arguments.destination}'")
+    except EventsRepoError as e:
+        print(e)
@@ -2,22 +2,26 @@ import os
 import datetime
 
 class UI:
-    def __init__(self, service):
+    def __init__(self, service, renderWorker):
         '''
         Constructor function for UI class
         
         Args:
             service (service object): Object that handles communication between UI and REPO
+            renderWorker (RenderWorker object): Object that creates and sets the wallpapers in the background
         '''
 
         self.__service = service
+        self.__renderWorker = renderWorker
 
         self.__actions = {
             1: self.__add_event,
             2: self.__mark_event_as_done,
             3: self.__delete_event,
             4: self.__print_events,
-            5: self.__load_wallpaper
+            5: self.__load_wallpaper,
+            6: self.__import_events,
+            7: self.__export_events
         }
 
         self.__printables = [
@@ -26,7 +30,9 @@ class UI:
             "2.Mark event as done",
             "3.Delete event",
             "4.See events",
-            "5.Load wallpaper"
+            "5.Load wallpaper",
+            "6.Import events (CSV / JSON lines / iCalendar)",
+            "7.Export events (CSV / JSON lines / iCalendar)"
         ]
 
     def __print_events(self, events = None):
@@ -67,6 +73,42 @@ class UI:
         except Exception as e:
             print(e)
 
+    def __import_events(self):
+        '''
+        Function that asks the user for the path of a file, then adds all the valid events from it
+        '''
+
+        path = input("Path of the file (.csv, .jsonl or .ics): ")
+
+        try:
+            added, rejected = self.__service.import_events(path)
+        except (OSError, ValueError) as e:
+            print(e)
+            return
+
+        print(f"Succesfully imported {added} events!")
+        if rejected:
+            print(f"{len(rejected)} records were not valid:")
+            for position, message in rejected[:10]:
+                print(f"    line {position}: {message}")
+            if len(rejected) > 10:
+                print(f"    and {len(rejected) - 10} more")
+
+    def __export_events(self):
+        '''
+        Function that asks the user for the path of a file, then writes all the events to it
+        '''
+
+        path = input("Path of the file (.csv, .jsonl or .ics): ")
+
+        try:
+            count = self.__service.export_events(path)
+        except (OSError, ValueError) as e:
+            print(e)
+            return
+
+        print(f"Succesfully exported {count} events!")
+
     def __delete_event(self):
         '''
         Function that prints all the current events to the users, and asks
@@ -123,11 +165,24 @@ class UI:
             print("Index out of range")
             return
         
-        try:
-            self.__service.create_set_wallpaper(wallpapers[selected-1])
-            print("Succesfully loaded wallpaper!")
-        except Exception as e:
-            print(e)
+        #The wallpaper is created in the background, the menu doesn't wait for it
+        self.__renderWorker.submit(wallpapers[selected-1], self.__print_load_result)
+        print("Loading the wallpaper in the background...")
+
+    @staticmethod
+    def __print_load_result(future):
+        '''
+        Function that prints the result of a background wallpaper load, nothing is printed
+        if a newer load replaced it
+        '''
+
+        if future.cancelled():
+            return
+
+        if future.exception() is not None:
+            print(f"\nCouldn't load the wallpaper: {future.exception()}")
+        else:
+            print("\nSuccesfully loaded wallpaper!")
 
     def __print_actions(self):
         for el in self.__printables: